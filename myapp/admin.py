@@ -5,7 +5,11 @@ from .models import (
     CustomUser, Domain, Tag, Project, CollaborationRequest, ProjectMember,
     Workspace, WorkspaceNote, Task, WorkspaceFile, WorkspaceChatMessage, Milestone,
     Follow, Comment, Like, ChatMessage, Community, Badge, UserBadge,
-    AIRecommendation, ProjectTemplate, ProjectCollaboration
+    AIRecommendation, ProjectTemplate, ProjectCollaboration, UserSkill, RecommendationDirty, ProjectFeatures,
+    AnnIndexDirty,
+    TimelineEntry, CelebrityCreator, TagSimilarity, TagSimilarityDirty, TagMonthlyCount,
+    ProjectEngagementBucket, ProjectTrendingScore, ProjectViewerSketch, ProjectDailyViewerSketch,
+    EmbeddingCache, FeedEvent
 )
 
 
@@ -143,11 +147,110 @@ class UserBadgeAdmin(admin.ModelAdmin):
 
 @admin.register(AIRecommendation)
 class AIRecommendationAdmin(admin.ModelAdmin):
-    list_display = ['user', 'project', 'score', 'created_at']
-    list_filter = ['created_at']
+    list_display = ['user', 'project', 'score', 'created_at', 'computed_at']
+    list_filter = ['computed_at']
     search_fields = ['user__username', 'project__title']
 
 
+@admin.register(TimelineEntry)
+class TimelineEntryAdmin(admin.ModelAdmin):
+    list_display = ['user', 'project', 'author', 'created_at']
+    search_fields = ['user__username', 'author__username']
+
+
+@admin.register(CelebrityCreator)
+class CelebrityCreatorAdmin(admin.ModelAdmin):
+    list_display = ['user', 'since']
+
+
+@admin.register(ProjectFeatures)
+class ProjectFeaturesAdmin(admin.ModelAdmin):
+    list_display = ['project', 'popularity', 'updated_at']
+    search_fields = ['project__title']
+
+
+@admin.register(TagSimilarity)
+class TagSimilarityAdmin(admin.ModelAdmin):
+    list_display = ['source', 'target', 'score']
+    search_fields = ['source__name', 'target__name']
+    raw_id_fields = ['source', 'target']
+
+
+@admin.register(TagSimilarityDirty)
+class TagSimilarityDirtyAdmin(admin.ModelAdmin):
+    list_display = ['tag', 'touched_at']
+    ordering = ['touched_at']
+
+
+@admin.register(TagMonthlyCount)
+class TagMonthlyCountAdmin(admin.ModelAdmin):
+    list_display = ['tag', 'month', 'count']
+    list_filter = ['month']
+    search_fields = ['tag__name']
+
+
+@admin.register(ProjectEngagementBucket)
+class ProjectEngagementBucketAdmin(admin.ModelAdmin):
+    list_display = ['project', 'hour', 'views', 'likes', 'comments']
+    raw_id_fields = ['project']
+
+
+@admin.register(ProjectTrendingScore)
+class ProjectTrendingScoreAdmin(admin.ModelAdmin):
+    list_display = ['project', 'log_score', 'updated_at']
+    ordering = ['-log_score']
+    raw_id_fields = ['project']
+
+
+@admin.register(ProjectViewerSketch)
+class ProjectViewerSketchAdmin(admin.ModelAdmin):
+    list_display = ['project']
+    raw_id_fields = ['project']
+    exclude = ['registers']
+
+
+@admin.register(ProjectDailyViewerSketch)
+class ProjectDailyViewerSketchAdmin(admin.ModelAdmin):
+    list_display = ['project', 'day']
+    list_filter = ['day']
+    raw_id_fields = ['project']
+    exclude = ['registers']
+
+
+@admin.register(RecommendationDirty)
+class RecommendationDirtyAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'object_id', 'enqueued_at', 'touched_at']
+    list_filter = ['kind']
+
+
+@admin.register(AnnIndexDirty)
+class AnnIndexDirtyAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'object_id', 'touched_at']
+    list_filter = ['kind']
+
+
+@admin.register(UserSkill)
+class UserSkillAdmin(admin.ModelAdmin):
+    list_display = ['skill', 'user']
+    search_fields = ['skill', 'user__username']
+
+
+@admin.register(EmbeddingCache)
+class EmbeddingCacheAdmin(admin.ModelAdmin):
+    list_display = ['model_name', 'content_hash', 'source_type', 'source_id', 'created_at']
+    list_filter = ['model_name', 'source_type']
+    search_fields = ['content_hash']
+    exclude = ['vector']
+
+
+@admin.register(FeedEvent)
+class FeedEventAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'project_id', 'user_id', 'surface', 'position', 'score', 'created_at']
+    list_filter = ['kind', 'surface']
+    date_hierarchy = 'created_at'
+    raw_id_fields = ['user']
+
+
 @admin.register(ProjectTemplate)
 class ProjectTemplateAdmin(admin.ModelAdmin):
     list_display = ['name', 'domain', 'created_at']
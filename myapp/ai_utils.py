@@ -7,13 +7,43 @@ AI utility functions for TRENDMIA
 - Project assistant features
 """
 
-from .models import Project, CustomUser, CollaborationRequest, ProjectMember, Domain, Tag
-from django.db.models import Q, Count
+from .models import (
+    Project, CustomUser, CollaborationRequest, ProjectMember, Domain, Tag, AIRecommendation, ProjectTrendingScore,
+)
+from .skill_index import get_candidate_user_ids
+from .embeddings import get_cached_embedding, get_cached_embeddings, get_embedding_client
+from .ann_index import PROJECT_INDEX, USER_INDEX, get_index
+from .project_features import get_project_features
+from .catalog import domain_names
+from .timeline import followed_projects_filter
+from .seen_filter import load_seen_filter
+from .scoring import (
+    COLLABORATOR_FEATURES, COLLABORATOR_WEIGHTS, PROJECT_FEATURES, PROJECT_WEIGHTS,
+    as_matrix, cosine_similarities, cosine_similarity, top_k, weighted_scores,
+)
+from django.conf import settings
+from django.db import connections
+from django.db.models import CharField, Q, Count, Value
 from django.utils import timezone
 from collections import Counter
+import numpy as np
 import os
 import json
 
+# Semantic neighbours pulled from the ANN index before the full rerank
+ANN_CANDIDATES = 200
+
+# Max candidates per hybrid feed retrieval bucket
+FEED_BUCKET_SIZES = getattr(settings, 'FEED_BUCKET_SIZES', {
+    'following': 120,
+    'domain': 120,
+    'seeking_collaborators': 120,
+    'trending': 120,
+    'recent': 120,
+})
+# Score multiplier for candidates the user has already seen (kept only to fill the feed)
+FEED_SEEN_PENALTY = getattr(settings, 'FEED_SEEN_PENALTY', 0.5)
+
 
 def calculate_skill_similarity(user_skills, required_skills):
     """Calculate similarity between user skills and required skills"""
@@ -69,8 +99,10 @@ def _tokenize_text(value):
 
 
 def _token_jaccard_similarity(text_a, text_b):
-    tokens_a = _tokenize_text(text_a)
-    tokens_b = _tokenize_text(text_b)
+    return _jaccard_similarity(_tokenize_text(text_a), _tokenize_text(text_b))
+
+
+def _jaccard_similarity(tokens_a, tokens_b):
     if not tokens_a or not tokens_b:
         return 0.0
     intersection = len(tokens_a & tokens_b)
@@ -81,14 +113,14 @@ def _token_jaccard_similarity(text_a, text_b):
 
 
 def _cosine_similarity(vec_a, vec_b):
-    if not vec_a or not vec_b or len(vec_a) != len(vec_b):
-        return 0.0
-    dot = sum(a * b for a, b in zip(vec_a, vec_b))
-    norm_a = sum(a * a for a in vec_a) ** 0.5
-    norm_b = sum(b * b for b in vec_b) ** 0.5
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+    return cosine_similarity(vec_a, vec_b)
+
+
+def _locations_match(location_a, location_b):
+    if not location_a or not location_b:
+        return False
+    a, b = location_a.lower(), location_b.lower()
+    return a in b or b in a
 
 
 def _get_gemini_client():
@@ -103,21 +135,59 @@ def _get_gemini_client():
         return None
 
 
-def _get_embedding(text):
-    """Best-effort embedding via Gemini text-embedding-004; returns None when unavailable."""
+def _get_embedding(text, source=None):
+    """Best-effort embedding from the configured provider, served from the embedding cache when possible."""
     if not text:
         return None
-    client = _get_gemini_client()
-    if not client:
-        return None
-    try:
-        result = client.models.embed_content(
-            model="text-embedding-004",
-            contents=text,
-        )
-        return list(result.embeddings[0].values)
-    except Exception:
-        return None
+    return get_cached_embedding(text, source=source)
+
+
+# Project fields build_project_text() reads: saving any of them re-embeds the project
+PROJECT_EMBEDDING_FIELDS = ('title', 'description', 'problem_statement', 'skills_required', 'domain')
+
+
+def build_project_text(project):
+    """Text embedded for a project (matching, similar projects, ANN index)."""
+    required_skills = project.skills_required if isinstance(project.skills_required, list) else []
+    return " ".join([
+        project.title or "",
+        project.description or "",
+        project.problem_statement or "",
+        " ".join(s for s in required_skills if isinstance(s, str)),
+        project.domain.name if project.domain else "",
+    ]).strip()
+
+
+def _load_user_project_context(user_ids):
+    """Recent project titles/descriptions (10 newest) and domain ids per user, in one query."""
+    titles, descriptions, domains = {}, {}, {}
+    for user_id, title, description, domain_id in (
+        Project.objects.filter(user_id__in=user_ids)
+        .order_by('-created_at')
+        .values_list('user_id', 'title', 'description', 'domain_id')
+    ):
+        if len(titles.setdefault(user_id, [])) < 10:
+            titles[user_id].append(title or "")
+            descriptions.setdefault(user_id, []).append(description or "")
+        if domain_id:
+            domains.setdefault(user_id, set()).add(domain_id)
+    return titles, descriptions, domains
+
+
+# User fields build_user_profile_text() reads (project titles/descriptions are
+# covered by the owner's project saves)
+USER_EMBEDDING_FIELDS = ('bio', 'location', 'skills')
+
+
+def build_user_profile_text(user, user_skills, titles=(), descriptions=()):
+    """Text embedded for a user profile (matching, ANN index)."""
+    return " ".join([
+        user.bio or "",
+        user.location or "",
+        " ".join(user_skills),
+        " ".join(titles),
+        " ".join(descriptions),
+    ]).strip()
 
 
 def find_collaborator_matches(project, limit=10):
@@ -132,95 +202,182 @@ def find_collaborator_matches(project, limit=10):
     if not required_skills:
         return []
 
-    project_text = " ".join([
-        project.title or "",
-        project.description or "",
-        project.problem_statement or "",
-        " ".join(required_skills),
-        project.domain.name if project.domain else "",
-    ]).strip()
-
-    project_embedding = _get_embedding(project_text)
-
-    # Get all users except project owner
-    all_users = CustomUser.objects.exclude(id=project.user.id)
+    project_text = build_project_text(project)
+    project_embedding = _get_embedding(project_text, source=('project', project.id))
+
+    # Candidates from the inverted skill index (plus a small exploration pool),
+    # then semantic neighbours of the project from the ANN index
+    candidate_ids = get_candidate_user_ids(project)
+    if project_embedding:
+        seen = set(candidate_ids)
+        for user_id, _ in get_index(USER_INDEX).search(
+            project_embedding, ANN_CANDIDATES,
+            exclude={project.user_id}, model_name=get_embedding_client().model_name,
+        ):
+            if user_id not in seen:
+                seen.add(user_id)
+                candidate_ids.append(user_id)
+    if not candidate_ids:
+        return []
+    users = list(CustomUser.objects.filter(id__in=candidate_ids))
 
     # Historical collaboration reliability for each requester
     requester_stats = {
         row['requester_id']: row
-        for row in CollaborationRequest.objects.values('requester_id').annotate(
+        for row in CollaborationRequest.objects.filter(requester_id__in=candidate_ids).values('requester_id').annotate(
             total=Count('id'),
             accepted=Count('id', filter=Q(status='accepted')),
         )
     }
-    
-    # Score each user
+
+    # Every candidate's own projects in one query, then their profile texts
+    titles, descriptions, domains = _load_user_project_context(candidate_ids)
+    user_skills_lists = [get_user_skills_list(user) for user in users]
+    user_texts = [
+        build_user_profile_text(user, user_skills, titles.get(user.id, []), descriptions.get(user.id, []))
+        for user, user_skills in zip(users, user_skills_lists)
+    ]
+
+    # One batched embedding pass for all candidates
+    semantic = np.array([_token_jaccard_similarity(project_text, text) for text in user_texts])
+    if project_embedding:
+        user_embeddings = get_cached_embeddings(user_texts, [('user', user.id) for user in users])
+        semantic = np.maximum(semantic, cosine_similarities(project_embedding, user_embeddings))
+
+    # Feature matrix: one row per candidate, columns as in COLLABORATOR_FEATURES
+    rows = []
+    for index, (user, user_skills) in enumerate(zip(users, user_skills_lists)):
+        stat = requester_stats.get(user.id)
+        reliability = (stat.get('accepted', 0) / stat['total']) if stat and stat.get('total') else 0.0
+        rows.append((
+            calculate_skill_similarity(user_skills, required_skills),
+            semantic[index],
+            1.0 if _locations_match(project.location, user.location) else 0.0,
+            1.0 if project.domain_id and project.domain_id in domains.get(user.id, ()) else 0.0,
+            reliability,
+            min(user.contribution_streak / 30, 1.0),  # Normalize to 0-1
+        ))
+    features = as_matrix(rows, COLLABORATOR_FEATURES)
+    scores = weighted_scores(features, COLLABORATOR_WEIGHTS)
+
+    # Only users with a meaningful match; reasons are built for the winners only
     scored_users = []
-    for user in all_users:
-        score = 0.0
+    for index in top_k(scores, limit, min_score=0.2):
+        skill_match, semantic_score, location, domain, reliability, _ = features[index]
         reasons = []
-
-        # Skill matching (weight: 0.35)
-        user_skills = get_user_skills_list(user)
-        skill_match = calculate_skill_similarity(user_skills, required_skills)
-        score += skill_match * 0.35
         if skill_match > 0.3:
             reasons.append(f"Matches {int(skill_match * 100)}% of required skills")
-
-        # Semantic profile-project matching (weight: 0.25)
-        user_text = " ".join([
-            user.bio or "",
-            user.location or "",
-            " ".join(user_skills),
-            " ".join(Project.objects.filter(user=user).values_list('title', flat=True)[:10]),
-            " ".join(Project.objects.filter(user=user).values_list('description', flat=True)[:10]),
-        ]).strip()
-
-        semantic_score = _token_jaccard_similarity(project_text, user_text)
-        if project_embedding:
-            user_embedding = _get_embedding(user_text)
-            if user_embedding:
-                semantic_score = max(semantic_score, _cosine_similarity(project_embedding, user_embedding))
-        score += semantic_score * 0.25
         if semantic_score > 0.2:
             reasons.append("Strong semantic match with project context")
+        if location:
+            reasons.append("Same location")
+        if domain:
+            reasons.append(f"Experience in {project.domain.name}")
+        if reliability >= 0.5:
+            reasons.append("Historically high acceptance in collaborations")
+        scored_users.append({
+            'user': users[index],
+            'score': float(scores[index]),
+            'reasons': reasons[:3]  # Top 3 reasons
+        })
+    return scored_users
 
-        # Location matching (weight: 0.15)
-        if project.location and user.location:
-            if project.location.lower() in user.location.lower() or user.location.lower() in project.location.lower():
-                score += 0.15
-                reasons.append("Same location")
-
-        # Domain interest matching (weight: 0.15)
-        if project.domain:
-            user_projects = Project.objects.filter(user=user)
-            user_domains = [p.domain for p in user_projects if p.domain]
-            if project.domain in user_domains:
-                score += 0.15
-                reasons.append(f"Experience in {project.domain.name}")
-
-        # Collaboration reliability (weight: 0.05)
-        stat = requester_stats.get(user.id)
-        if stat and stat.get('total'):
-            acceptance_rate = (stat.get('accepted', 0) / stat['total'])
-            score += acceptance_rate * 0.05
-            if acceptance_rate >= 0.5:
-                reasons.append("Historically high acceptance in collaborations")
-
-        # Activity score (weight: 0.05)
-        activity_score = min(user.contribution_streak / 30, 1.0)  # Normalize to 0-1
-        score += activity_score * 0.05
-
-        if score > 0.2:  # Only include users with meaningful match
-            scored_users.append({
-                'user': user,
-                'score': score,
-                'reasons': reasons[:3]  # Top 3 reasons
-            })
-    
-    # Sort by score and return top matches
-    scored_users.sort(key=lambda x: x['score'], reverse=True)
-    return scored_users[:limit]
+
+# Stages whose projects are still looking for people
+RECOMMENDABLE_STAGES = ('idea', 'seeking_collaborators')
+
+
+def load_recommendable_projects():
+    """
+    Feature columns for every public project that can be recommended, from one
+    query. Shared across users by the batch recommender.
+    """
+    ids, skills, domain_ids, locations, popularity = [], [], [], [], []
+    for project_id, skills_required, domain_id, location, views_count, likes_count in Project.objects.filter(
+        visibility='public',
+        stage__in=RECOMMENDABLE_STAGES,
+    ).values_list('id', 'skills_required', 'domain_id', 'location', 'views_count', 'likes_count'):
+        ids.append(project_id)
+        skills.append(tuple(skills_required) if isinstance(skills_required, list) else ())
+        domain_ids.append(domain_id or 0)
+        locations.append(location or "")
+        popularity.append(min((views_count + likes_count) / 100, 1.0))
+    return {
+        'ids': np.array(ids, dtype=np.int64),
+        'skills': skills,
+        'domain_ids': np.array(domain_ids, dtype=np.int64),
+        'locations': locations,
+        'popularity': np.array(popularity, dtype=np.float64),
+        'domain_names': domain_names(),
+    }
+
+
+def score_projects_for_user(user, candidates, excluded_ids=(), user_domain_ids=(), limit=10):
+    """
+    Rank candidate projects (from load_recommendable_projects) for one user.
+    Returns [{'project_id', 'score', 'reasons'}], best first.
+    """
+    ids = candidates['ids']
+    if not len(ids):
+        return []
+    user_skills = get_user_skills_list(user)
+
+    # Many projects share the same skill list; score each distinct list once
+    skill_scores = {}
+    skill_column = np.array([
+        skill_scores[skills] if skills in skill_scores
+        else skill_scores.setdefault(skills, calculate_skill_similarity(user_skills, list(skills)))
+        for skills in candidates['skills']
+    ], dtype=np.float64)
+    domain_column = np.isin(candidates['domain_ids'], [d for d in user_domain_ids if d]).astype(np.float64)
+    location_column = np.array(
+        [1.0 if _locations_match(location, user.location) else 0.0 for location in candidates['locations']]
+    )
+
+    # Feature matrix: one row per project, columns as in PROJECT_FEATURES
+    features = np.column_stack([skill_column, domain_column, location_column, candidates['popularity']])
+    scores = weighted_scores(features, PROJECT_WEIGHTS)
+    if excluded_ids:
+        scores[np.isin(ids, list(excluded_ids))] = 0.0
+
+    recommendations = []
+    for index in top_k(scores, limit, min_score=0.2):
+        skill_match, domain, location, _ = features[index]
+        reasons = []
+        if skill_match > 0.3:
+            reasons.append(f"Matches your skills ({int(skill_match * 100)}%)")
+        if domain:
+            domain_name = candidates['domain_names'].get(int(candidates['domain_ids'][index]), "")
+            reasons.append(f"Similar to your {domain_name} projects")
+        if location:
+            reasons.append("Near your location")
+        recommendations.append({
+            'project_id': int(ids[index]),
+            'score': float(scores[index]),
+            'reasons': reasons[:3],
+        })
+    return recommendations
+
+
+def compute_project_recommendations(user, limit=10):
+    """Live scoring for one user (used when no precomputed rows exist)."""
+    # Projects user hasn't created or already collaborated on
+    owned = list(Project.objects.filter(user=user).values_list('id', 'domain_id'))
+    collaborated = ProjectMember.objects.filter(user=user).values_list('project_id', flat=True)
+    excluded_ids = {project_id for project_id, _ in owned} | set(collaborated)
+    user_domain_ids = {domain_id for _, domain_id in owned if domain_id}
+
+    recommendations = score_projects_for_user(
+        user, load_recommendable_projects(), excluded_ids, user_domain_ids, limit
+    )
+    projects = Project.objects.select_related('domain').in_bulk([r['project_id'] for r in recommendations])
+    scored_projects = []
+    for rec in recommendations:
+        project = projects.get(rec['project_id'])
+        if project is None:
+            continue
+        scored_projects.append({'project': project, 'score': rec['score'], 'reasons': rec['reasons']})
+    return scored_projects
 
 
 def get_ai_project_recommendations(user, limit=10):
@@ -228,61 +385,147 @@ def get_ai_project_recommendations(user, limit=10):
     Get AI-powered project recommendations for a user based on:
     - User's skills
     - Past projects
-    - Followed users' projects
     - Location
     - Domain interests
+    Served from the AIRecommendation table (written by the batch recommender);
+    users without rows yet are scored live.
     """
-    user_skills = get_user_skills_list(user)
-    
-    # Get projects user hasn't created or already collaborated on
-    user_projects = Project.objects.filter(user=user).values_list('id', flat=True)
-    collaborated_projects = ProjectMember.objects.filter(user=user).values_list('project_id', flat=True)
-    excluded_ids = list(user_projects) + list(collaborated_projects)
-    
-    available_projects = Project.objects.exclude(id__in=excluded_ids).filter(
-        visibility='public',
-        stage__in=['idea', 'seeking_collaborators']
+    stored = list(
+        AIRecommendation.objects.filter(
+            user=user,
+            project__visibility='public',
+            project__stage__in=RECOMMENDABLE_STAGES,
+        ).select_related('project', 'project__domain')[:limit]
     )
-    
-    scored_projects = []
-    for project in available_projects:
-        score = 0.0
-        reasons = []
-        
-        # Skill matching (weight: 0.4)
-        required_skills = project.skills_required if isinstance(project.skills_required, list) else []
-        if required_skills:
-            skill_match = calculate_skill_similarity(user_skills, required_skills)
-            score += skill_match * 0.4
-            if skill_match > 0.3:
-                reasons.append(f"Matches your skills ({int(skill_match * 100)}%)")
-        
-        # Domain matching (weight: 0.3)
-        if project.domain:
-            user_domains = [p.domain for p in Project.objects.filter(user=user) if p.domain]
-            if project.domain in user_domains:
-                score += 0.3
-                reasons.append(f"Similar to your {project.domain.name} projects")
-        
-        # Location matching (weight: 0.2)
-        if project.location and user.location:
-            if project.location.lower() in user.location.lower() or user.location.lower() in project.location.lower():
-                score += 0.2
-                reasons.append("Near your location")
-        
-        # Popularity boost (weight: 0.1)
-        popularity = min((project.views_count + project.likes_count) / 100, 1.0)
-        score += popularity * 0.1
-        
-        if score > 0.2:
-            scored_projects.append({
-                'project': project,
-                'score': score,
-                'reasons': reasons[:3]
-            })
-    
-    scored_projects.sort(key=lambda x: x['score'], reverse=True)
-    return scored_projects[:limit]
+    if stored:
+        return [
+            {'project': rec.project, 'score': rec.score, 'reasons': rec.reason.splitlines()}
+            for rec in stored
+        ]
+    return compute_project_recommendations(user, limit)
+
+
+def get_similar_projects(project, limit=6):
+    """
+    Public projects semantically close to this one: ANN neighbours reranked by
+    exact cosine plus a same-domain bonus. Falls back to recent projects in the
+    same domain when the index has nothing.
+    """
+    project_embedding = _get_embedding(build_project_text(project), source=('project', project.id))
+    neighbours = []
+    if project_embedding:
+        neighbours = get_index(PROJECT_INDEX).search(
+            project_embedding, limit * 4,
+            exclude={project.id}, model_name=get_embedding_client().model_name,
+        )
+    if neighbours:
+        candidates = Project.objects.select_related('user', 'domain').filter(
+            visibility='public'
+        ).in_bulk([project_id for project_id, _ in neighbours])
+        ranked = []
+        for project_id, similarity in neighbours:
+            candidate = candidates.get(project_id)
+            if candidate is None:
+                continue
+            bonus = 0.1 if project.domain_id and candidate.domain_id == project.domain_id else 0.0
+            ranked.append((similarity + bonus, candidate))
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        if ranked:
+            return [candidate for _, candidate in ranked[:limit]]
+
+    if not project.domain_id:
+        return []
+    return list(
+        Project.objects.select_related('user', 'domain')
+        .filter(visibility='public', domain_id=project.domain_id)
+        .exclude(id=project.id)
+        .order_by('-created_at')[:limit]
+    )
+
+
+def _feed_bucket_querysets(user, base_qs, followed_user_ids, user_domain_ids):
+    """
+    (bucket name, ordered queryset) for each non-empty SQL retrieval bucket, in
+    merge order. The trending bucket is read separately (_trending_project_ids).
+    """
+    buckets = []
+    if followed_user_ids:
+        # Materialized home timeline (+ followed celebrities) instead of an IN over every followed creator
+        buckets.append(('following', base_qs.filter(followed_projects_filter(user))))
+    if user_domain_ids:
+        buckets.append(('domain', base_qs.filter(domain_id__in=user_domain_ids)))
+    buckets.append(('seeking_collaborators', base_qs.filter(stage='seeking_collaborators')))
+    buckets.append(('recent', base_qs))
+    return buckets
+
+
+def _trending_project_ids(base_qs, limit):
+    """
+    Ids of the highest forward-decayed trending scores among base_qs. Walks the
+    log_score index and checks base_qs membership per row, so it stops after
+    `limit` hits instead of sorting the catalog.
+    """
+    return list(
+        ProjectTrendingScore.objects.filter(project_id__in=base_qs.order_by().values('id'))
+        .order_by('-log_score')
+        .values_list('project_id', flat=True)[:limit]
+    )
+
+
+def _retrieve_feed_candidates(user, base_qs, followed_user_ids, user_domain_ids):
+    """
+    Candidate project ids from every retrieval bucket with the buckets each came
+    from, in first-seen order (bucket order, then each bucket's own ordering).
+    One UNION ALL query where the backend supports sliced/ordered parts,
+    otherwise one query per bucket.
+    """
+    buckets = _feed_bucket_querysets(user, base_qs, followed_user_ids, user_domain_ids)
+    order_fields = set()
+    parts = []
+    for name, qs in buckets:
+        ordering = [f for f in (qs.query.order_by or Project._meta.ordering) if isinstance(f, str)]
+        order_fields.update(f.lstrip('-') for f in ordering)
+        parts.append((name, ordering, qs))
+
+    value_fields = ['id', 'feed_bucket', *sorted(order_fields - {'id'})]
+    sliced = [
+        qs.annotate(feed_bucket=Value(name, output_field=CharField()))
+        .values(*value_fields)[:FEED_BUCKET_SIZES.get(name, 120)]
+        for name, _, qs in parts
+    ]
+    if connections[base_qs.db].features.supports_slicing_ordering_in_compound and len(sliced) > 1:
+        rows = list(sliced[0].union(*sliced[1:], all=True))
+    else:
+        rows = [row for part in sliced for row in part]
+
+    by_bucket = {name: [] for name, _, _ in parts}
+    for row in rows:
+        by_bucket[row['feed_bucket']].append(row)
+
+    bucket_ids = {}
+    for name, ordering, _ in parts:
+        bucket_rows = by_bucket[name]
+        # Reapply the bucket's ordering (stable sorts, least significant field first)
+        for field in reversed(ordering):
+            bucket_rows.sort(key=lambda row: row[field.lstrip('-')], reverse=field.startswith('-'))
+        bucket_ids[name] = [row['id'] for row in bucket_rows]
+
+    # Trending: scored projects first, then the most recent unscored ones
+    trending_limit = FEED_BUCKET_SIZES.get('trending', 120)
+    trending_ids = _trending_project_ids(base_qs, trending_limit)
+    if len(trending_ids) < trending_limit:
+        scored = set(trending_ids)
+        trending_ids += [
+            project_id for project_id in bucket_ids['recent'] if project_id not in scored
+        ][:trending_limit - len(trending_ids)]
+
+    origins = {}
+    merge_order = [name for name, _, _ in parts]
+    merge_order.insert(merge_order.index('recent'), 'trending')
+    for name in merge_order:
+        for project_id in trending_ids if name == 'trending' else bucket_ids[name]:
+            origins.setdefault(project_id, []).append(name)
+    return origins
 
 
 def get_hybrid_feed_projects(user, base_queryset=None, limit=60):
@@ -291,66 +534,74 @@ def get_hybrid_feed_projects(user, base_queryset=None, limit=60):
     1) Candidate retrieval from follows, domain affinity, collaboration context, and trending.
     2) Deterministic reranking with affinity, semantic overlap, recency, and popularity.
     """
+    base_qs = base_queryset if base_queryset is not None else (
+        Project.objects.filter(visibility='public').order_by('-created_at')
+    )
     if not user or not getattr(user, 'is_authenticated', False):
-        projects = (base_queryset or Project.objects.filter(visibility='public').order_by('-created_at'))[:limit]
-        return list(projects)
+        return list(base_qs[:limit])
 
-    base_qs = base_queryset or Project.objects.filter(visibility='public').order_by('-created_at')
     followed_user_ids = set(user.following.values_list('following_id', flat=True))
-    user_projects = Project.objects.filter(user=user).prefetch_related('tags')
-    user_project_ids = set(user_projects.values_list('id', flat=True))
+    user_projects = list(Project.objects.filter(user=user).order_by('-created_at'))
+    user_project_ids = {p.id for p in user_projects}
     collaborated_project_ids = set(ProjectMember.objects.filter(user=user).values_list('project_id', flat=True))
 
-    user_domain_ids = set(user_projects.exclude(domain__isnull=True).values_list('domain_id', flat=True))
+    user_domain_ids = {p.domain_id for p in user_projects if p.domain_id}
     user_tags = set()
-    for p in user_projects:
-        user_tags.update([t.name.lower() for t in p.tags.all()])
-
-    # Candidate retrieval buckets
-    candidates_following = base_qs.filter(user_id__in=followed_user_ids)[:120]
-    candidates_domain = base_qs.filter(domain_id__in=user_domain_ids)[:120] if user_domain_ids else base_qs.none()
-    candidates_collab_stage = base_qs.filter(stage='seeking_collaborators')[:120]
-    candidates_trending = base_qs.order_by('-likes_count', '-views_count')[:120]
-    candidates_recent = base_qs[:120]
-
-    candidate_map = {}
-    for bucket in [candidates_following, candidates_domain, candidates_collab_stage, candidates_trending, candidates_recent]:
-        for project in bucket:
-            if project.id in user_project_ids:
-                continue
-            candidate_map[project.id] = project
-
-    candidates = list(candidate_map.values())
+    for features in get_project_features(user_projects).values():
+        user_tags.update(features.tags)
+
+    # Candidate retrieval: all buckets in one query, then users/tags for the merged set
+    origins = _retrieve_feed_candidates(user, base_qs, followed_user_ids, user_domain_ids)
+    candidate_ids = [project_id for project_id in origins if project_id not in user_project_ids]
+
+    # Already-seen projects are skipped unless they are needed to fill the feed
+    seen = load_seen_filter(user.id)
+    seen_ids = set()
+    if seen:
+        unseen_ids, refill = [], []
+        for project_id in candidate_ids:
+            (refill if project_id in seen else unseen_ids).append(project_id)
+        seen_ids = set(refill)
+        candidate_ids = unseen_ids + refill[:max(limit - len(unseen_ids), 0)]
+
+    projects = (
+        Project.objects.select_related('user', 'domain')
+        .prefetch_related('tags')
+        .in_bulk(candidate_ids)
+    )
+    candidates = []
+    for project_id in candidate_ids:
+        project = projects.get(project_id)
+        if project is not None:
+            project.feed_buckets = origins[project_id]
+            candidates.append(project)
     if not candidates:
         return []
 
-    user_profile_text = " ".join([
+    user_tokens = _tokenize_text(" ".join([
         user.bio or "",
         user.location or "",
         " ".join(sorted(user_tags)),
-        " ".join(user_projects.values_list('title', flat=True)[:10]),
-    ]).strip()
+        " ".join(p.title or "" for p in user_projects[:10]),
+    ]))
+
+    # Precomputed per-project features: no per-candidate tokenizing or tag queries
+    candidate_features = get_project_features(candidates)
 
     scored = []
     now = timezone.now()
     for project in candidates:
-        project_tags = set(tag.name.lower() for tag in project.tags.all())
-        project_skills = set(s.lower() for s in (project.skills_required or []) if isinstance(s, str))
-        tag_overlap = len(user_tags & (project_tags | project_skills))
-        union_size = len(user_tags | project_tags | project_skills) or 1
+        features = candidate_features[project.id]
+        project_terms = set(features.tags) | set(features.skills)
+        tag_overlap = len(user_tags & project_terms)
+        union_size = len(user_tags | project_terms) or 1
         tag_score = tag_overlap / union_size
 
-        project_text = " ".join([
-            project.title or "",
-            project.description or "",
-            project.problem_statement or "",
-            " ".join(project.skills_required or []),
-        ]).strip()
-        semantic_score = _token_jaccard_similarity(user_profile_text, project_text)
+        semantic_score = _jaccard_similarity(user_tokens, set(features.tokens))
 
         age_days = max((now - project.created_at).days, 0)
         recency_score = 1.0 / (1.0 + (age_days / 7.0))
-        popularity_score = min((project.likes_count * 2 + project.views_count) / 200.0, 1.0)
+        popularity_score = features.popularity
 
         follow_score = 1.0 if project.user_id in followed_user_ids else 0.0
         domain_score = 1.0 if project.domain_id and project.domain_id in user_domain_ids else 0.0
@@ -365,6 +616,8 @@ def get_hybrid_feed_projects(user, base_queryset=None, limit=60):
             popularity_score * 0.04 +
             collab_context_score * 0.02
         )
+        if project.id in seen_ids:
+            final_score *= FEED_SEEN_PENALTY
 
         reasons = []
         if follow_score:
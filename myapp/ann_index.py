@@ -0,0 +1,323 @@
+# myapp/ann_index.py
+
+"""
+Approximate nearest-neighbour index over user-profile and project embeddings
+- IVF (inverted file) index in NumPy: spherical k-means centroids, only the
+  closest `nprobe` lists are scanned per query
+- Persisted per index as <name>.npz (compacted base) + <name>.delta
+  (append-only upserts/removals replayed on load)
+- Rebuilt nightly (Celery beat) or by `manage.py rebuild_ann_index`, updated
+  incrementally from the AnnIndexDirty queue (myapp/ann_queue.py)
+"""
+
+import os
+import struct
+import threading
+
+import numpy as np
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+
+ANN_INDEX_DIR = getattr(settings, 'ANN_INDEX_DIR', os.path.join(settings.BASE_DIR, 'var', 'ann'))
+ANN_NPROBE = getattr(settings, 'ANN_NPROBE', 8)
+
+USER_INDEX = 'users'
+PROJECT_INDEX = 'projects'
+
+_DELTA_HEADER = struct.Struct('<qB')  # item id, op
+_OP_UPSERT = 1
+_OP_REMOVE = 2
+
+
+def _normalize_rows(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def train_centroids(vectors, nlist, iterations=10, sample_size=20000, seed=0):
+    """Spherical k-means on (a sample of) normalized vectors."""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > sample_size:
+        vectors = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    nlist = max(1, min(nlist, len(vectors)))
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        for list_no in range(nlist):
+            members = vectors[assignments == list_no]
+            if len(members):
+                centroids[list_no] = members.mean(axis=0)
+        centroids = _normalize_rows(centroids)
+    return centroids
+
+
+class IVFIndex:
+    """In-memory IVF index. Vectors are stored normalized (float16), so dot product == cosine."""
+
+    def __init__(self, dim, model_name, centroids=None):
+        self.dim = dim
+        self.model_name = model_name
+        self.centroids = (
+            _normalize_rows(centroids) if centroids is not None and len(centroids)
+            else np.zeros((0, dim), dtype=np.float32)
+        )
+        self._ids = np.full(0, -1, dtype=np.int64)
+        self._vectors = np.zeros((0, dim), dtype=np.float16)
+        self._lists = np.full(0, -1, dtype=np.int32)
+        self._size = 0  # used slots, including tombstones
+        self._slots = {}  # item id -> slot
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, item_id):
+        return item_id in self._slots
+
+    @classmethod
+    def build(cls, ids, vectors, model_name, nlist=None):
+        vectors = _normalize_rows(vectors) if len(ids) else np.zeros((0, 0), dtype=np.float32)
+        dim = vectors.shape[1] if len(ids) else 0
+        if nlist is None:
+            nlist = max(1, min(1024, int(np.sqrt(len(ids)))))
+        centroids = train_centroids(vectors, nlist) if len(ids) else None
+        index = cls(dim, model_name, centroids)
+        index.add_many(ids, vectors)
+        return index
+
+    def _assign(self, vectors):
+        if not len(self.centroids):
+            return np.zeros(len(vectors), dtype=np.int32)
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 64)
+        ids = np.full(capacity, -1, dtype=np.int64)
+        vectors = np.zeros((capacity, self.dim), dtype=np.float16)
+        lists = np.full(capacity, -1, dtype=np.int32)
+        ids[:self._size] = self._ids[:self._size]
+        vectors[:self._size] = self._vectors[:self._size]
+        lists[:self._size] = self._lists[:self._size]
+        self._ids, self._vectors, self._lists = ids, vectors, lists
+
+    def add_many(self, ids, vectors):
+        """Insert or replace items."""
+        if not len(ids):
+            return
+        vectors = _normalize_rows(vectors)
+        assignments = self._assign(vectors)
+        self._reserve(len(ids))
+        for item_id, vector, list_no in zip(ids, vectors, assignments):
+            item_id = int(item_id)
+            slot = self._slots.get(item_id)
+            if slot is None:
+                slot = self._size
+                self._size += 1
+                self._slots[item_id] = slot
+                self._ids[slot] = item_id
+            self._vectors[slot] = vector
+            self._lists[slot] = list_no
+
+    def add(self, item_id, vector):
+        self.add_many([item_id], [vector])
+
+    def remove(self, item_id):
+        slot = self._slots.pop(int(item_id), None)
+        if slot is not None:
+            self._ids[slot] = -1
+            self._lists[slot] = -1
+
+    def search(self, query, k, nprobe=ANN_NPROBE, exclude=()):
+        """Top-k (item_id, cosine) pairs, best first, scanning the nprobe closest lists."""
+        if not self._slots or query is None or len(query) != self.dim:
+            return []
+        q = _normalize_rows(query)[0]
+        lists = self._lists[:self._size]
+        if len(self.centroids) > nprobe:
+            probes = np.argpartition(-(self.centroids @ q), nprobe - 1)[:nprobe]
+            candidates = np.flatnonzero(np.isin(lists, probes))
+        else:
+            candidates = np.flatnonzero(lists >= 0)
+        if exclude:
+            excluded = np.isin(self._ids[candidates], np.fromiter(exclude, dtype=np.int64))
+            candidates = candidates[~excluded]
+        if not len(candidates):
+            return []
+        scores = self._vectors[candidates].astype(np.float32) @ q
+        if len(candidates) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(candidates))
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(int(self._ids[candidates[i]]), float(scores[i])) for i in best]
+
+    def save(self, path):
+        """Write a compacted snapshot atomically."""
+        live = np.flatnonzero(self._ids[:self._size] >= 0)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as handle:
+            np.savez(
+                handle,
+                ids=self._ids[live],
+                vectors=self._vectors[live],
+                lists=self._lists[live],
+                centroids=self.centroids,
+                model_name=np.array(self.model_name),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            vectors = data['vectors']
+            centroids = data['centroids']
+            dim = vectors.shape[1] if vectors.ndim == 2 and vectors.shape[1] else centroids.shape[1]
+            index = cls(dim, str(data['model_name']), centroids)
+            ids = data['ids']
+            index._reserve(len(ids))
+            index._ids[:len(ids)] = ids
+            index._vectors[:len(ids)] = vectors
+            index._lists[:len(ids)] = data['lists']
+            index._size = len(ids)
+            index._slots = {int(item_id): slot for slot, item_id in enumerate(ids)}
+        return index
+
+
+class PersistentIndex:
+    """
+    An IVFIndex backed by <dir>/<name>.npz plus an append-only delta log.
+    Other processes' incremental updates are picked up by replaying the log tail.
+    """
+
+    def __init__(self, name, directory=ANN_INDEX_DIR):
+        self.name = name
+        self.base_path = os.path.join(directory, f'{name}.npz')
+        self.delta_path = os.path.join(directory, f'{name}.delta')
+        self.lock_path = os.path.join(directory, f'{name}.lock')
+        self._index = None
+        self._base_mtime = None
+        self._delta_offset = 0
+        self._lock = threading.Lock()
+
+    def _file_lock(self):
+        os.makedirs(os.path.dirname(self.base_path), exist_ok=True)
+        handle = open(self.lock_path, 'a')
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _record_size(self, dim):
+        return _DELTA_HEADER.size + 4 * dim
+
+    def _refresh(self):
+        """Load the base snapshot if it changed on disk, then replay any new delta records."""
+        try:
+            base_mtime = os.stat(self.base_path).st_mtime_ns
+        except FileNotFoundError:
+            self._index, self._base_mtime, self._delta_offset = None, None, 0
+            return
+        if base_mtime != self._base_mtime:
+            self._index = IVFIndex.load(self.base_path)
+            self._base_mtime = base_mtime
+            self._delta_offset = 0
+        try:
+            delta_size = os.path.getsize(self.delta_path)
+        except FileNotFoundError:
+            return
+        record_size = self._record_size(self._index.dim)
+        if delta_size - self._delta_offset < record_size:
+            return
+        with open(self.delta_path, 'rb') as handle:
+            handle.seek(self._delta_offset)
+            while True:
+                record = handle.read(record_size)
+                if len(record) < record_size:
+                    break
+                item_id, op = _DELTA_HEADER.unpack_from(record)
+                if op == _OP_REMOVE:
+                    self._index.remove(item_id)
+                else:
+                    vector = np.frombuffer(record, dtype=np.float32, offset=_DELTA_HEADER.size)
+                    self._index.add(item_id, vector)
+                self._delta_offset += record_size
+
+    def get(self):
+        with self._lock:
+            self._refresh()
+            return self._index
+
+    def search(self, query, k, nprobe=ANN_NPROBE, exclude=(), model_name=None):
+        index = self.get()
+        if index is None or (model_name and index.model_name != model_name):
+            return []
+        return index.search(query, k, nprobe=nprobe, exclude=exclude)
+
+    def rebuild(self, ids, vectors, model_name, nlist=None):
+        index = IVFIndex.build(ids, vectors, model_name, nlist=nlist)
+        handle = self._file_lock()
+        try:
+            # Truncate before swapping the base, so no reader replays old records onto the new one
+            open(self.delta_path, 'wb').close()
+            index.save(self.base_path)
+        finally:
+            handle.close()
+        with self._lock:
+            self._index, self._base_mtime, self._delta_offset = None, None, 0
+        return index
+
+    def _append(self, item_id, op, vector, model_name):
+        handle = self._file_lock()
+        try:
+            with self._lock:
+                self._refresh()
+                stale = self._index is not None and not len(self._index) and (
+                    self._index.model_name != model_name or self._index.dim != len(vector)
+                )
+                if self._index is None or stale:
+                    # First write before any rebuild: start an empty (brute-force) index
+                    open(self.delta_path, 'wb').close()
+                    IVFIndex(len(vector), model_name).save(self.base_path)
+                    self._refresh()
+                index = self._index
+                if index.model_name != model_name or index.dim != len(vector):
+                    return False  # built with another embedding model; needs a rebuild
+                record = _DELTA_HEADER.pack(int(item_id), op) + np.asarray(vector, dtype=np.float32).tobytes()
+                with open(self.delta_path, 'ab') as delta:
+                    delta.write(record)
+                self._refresh()
+                return True
+        finally:
+            handle.close()
+
+    def upsert(self, item_id, vector, model_name):
+        if not vector:
+            return False
+        return self._append(item_id, _OP_UPSERT, vector, model_name)
+
+    def remove(self, item_id):
+        index = self.get()
+        if index is None or item_id not in index:
+            return False
+        return self._append(item_id, _OP_REMOVE, np.zeros(index.dim, dtype=np.float32), index.model_name)
+
+
+_indexes = {}
+
+
+def get_index(name):
+    """Process-wide PersistentIndex for 'users' or 'projects'."""
+    if name not in _indexes:
+        _indexes[name] = PersistentIndex(name)
+    return _indexes[name]
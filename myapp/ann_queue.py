@@ -0,0 +1,128 @@
+# myapp/ann_queue.py
+
+"""
+Background maintenance of the ANN indexes (myapp/ann_index.py)
+- Profile/project saves and deletes only mark the object in AnnIndexDirty; no
+  embedding call or index write happens in the saving request
+- process_ann_queue() (Celery beat, every minute) re-embeds the queued objects
+  in one batched embedding call per kind and upserts them, or removes objects
+  that no longer exist
+- rebuild_ann_indexes() (nightly beat task and `manage.py rebuild_ann_index`)
+  re-embeds everything and writes fresh compacted snapshots, which also
+  truncates the delta logs
+"""
+
+import logging
+
+from django.utils import timezone
+
+from .ai_utils import _load_user_project_context, build_project_text, build_user_profile_text, get_user_skills_list
+from .ann_index import PROJECT_INDEX, USER_INDEX, get_index
+from .embeddings import get_cached_embeddings, get_embedding_client
+from .models import AnnIndexDirty, CustomUser, Project
+
+
+ANN_QUEUE_BATCH = 200
+ANN_REBUILD_CHUNK_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+def mark_ann_dirty(kind, object_ids):
+    """Queue users/projects for re-indexing; re-marking only bumps touched_at."""
+    now = timezone.now()
+    rows = [
+        AnnIndexDirty(kind=kind, object_id=object_id, touched_at=now)
+        for object_id in {int(object_id) for object_id in object_ids if object_id}
+    ]
+    if rows:
+        AnnIndexDirty.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['kind', 'object_id'],
+            update_fields=['touched_at'],
+        )
+
+
+def _user_texts(users):
+    titles, descriptions, _ = _load_user_project_context([user.id for user in users])
+    texts = [
+        build_user_profile_text(
+            user, get_user_skills_list(user), titles.get(user.id, []), descriptions.get(user.id, [])
+        )
+        for user in users
+    ]
+    return texts, [('user', user.id) for user in users]
+
+
+def _project_texts(projects):
+    return [build_project_text(p) for p in projects], [('project', p.id) for p in projects]
+
+
+# kind -> (index name, queryset, text builder)
+_TARGETS = {
+    'user': (USER_INDEX, lambda: CustomUser.objects.all(), _user_texts),
+    'project': (PROJECT_INDEX, lambda: Project.objects.select_related('domain'), _project_texts),
+}
+
+
+def _embed(objects, build_texts):
+    """[(id, vector)] for the objects that produced an embedding (one batched call)."""
+    if not objects:
+        return []
+    texts, sources = build_texts(objects)
+    return [
+        (obj.id, vector)
+        for obj, vector in zip(objects, get_cached_embeddings(texts, sources))
+        if vector
+    ]
+
+
+def process_ann_queue(max_items=ANN_QUEUE_BATCH):
+    """
+    Re-index up to max_items queued objects. Entries re-marked while the batch
+    runs stay queued. Returns {'upserted', 'removed'}.
+    """
+    claimed_at = timezone.now()
+    entries = list(AnnIndexDirty.objects.order_by('touched_at').values_list('id', 'kind', 'object_id')[:max_items])
+    upserted = removed = 0
+    model_name = get_embedding_client().model_name
+    for kind, (name, queryset, build_texts) in _TARGETS.items():
+        object_ids = {object_id for _, entry_kind, object_id in entries if entry_kind == kind}
+        if not object_ids:
+            continue
+        index = get_index(name)
+        objects = list(queryset().filter(id__in=object_ids).order_by('id'))
+        for object_id in object_ids - {obj.id for obj in objects}:
+            removed += index.remove(object_id)
+        for object_id, vector in _embed(objects, build_texts):
+            upserted += index.upsert(object_id, vector, model_name)
+    AnnIndexDirty.objects.filter(
+        id__in=[entry_id for entry_id, _, _ in entries],
+        touched_at__lte=claimed_at,
+    ).delete()
+    if entries:
+        logger.info("ANN queue: %d entries, %d upserted, %d removed", len(entries), upserted, removed)
+    return {'upserted': upserted, 'removed': removed}
+
+
+def rebuild_ann_indexes(target='all', chunk_size=ANN_REBUILD_CHUNK_SIZE, nlist=None):
+    """Re-embed and rebuild the user and/or project index. Returns {index name: index}."""
+    rebuilt = {}
+    for kind, (name, queryset, build_texts) in _TARGETS.items():
+        if target not in (name, 'all'):
+            continue
+        ids, vectors = [], []
+        chunk = []
+        for obj in queryset().order_by('id').iterator(chunk_size=chunk_size):
+            chunk.append(obj)
+            if len(chunk) >= chunk_size:
+                for object_id, vector in _embed(chunk, build_texts):
+                    ids.append(object_id)
+                    vectors.append(vector)
+                chunk = []
+        for object_id, vector in _embed(chunk, build_texts):
+            ids.append(object_id)
+            vectors.append(vector)
+        rebuilt[name] = get_index(name).rebuild(ids, vectors, get_embedding_client().model_name, nlist=nlist)
+    return rebuilt
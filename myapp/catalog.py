@@ -0,0 +1,79 @@
+# myapp/catalog.py
+
+"""
+Versioned in-process cache of the Domain and Tag catalogs
+- Each worker keeps immutable tuples of all domains and tags (id order)
+- A version token in the shared Django cache is replaced on every Domain/Tag
+  save or delete (see signals); a worker reloads only when it sees a new token
+  (shared across workers only when CACHES is Redis, i.e. REDIS_URL is set)
+- Views use get_domains()/get_tags(), forms use the *_choices() helpers, so
+  rendering a page costs one cache read instead of catalog queries
+"""
+
+import threading
+import time
+
+from django.core.cache import cache
+
+from .models import Domain, Tag
+
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+_lock = threading.Lock()
+_catalog = (None, (), ())  # (version, domains, tags)
+
+
+def bump_catalog_version():
+    """Invalidate every worker's catalog copy."""
+    cache.set(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+
+def _current_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def _load():
+    global _catalog
+    version = _current_version()
+    catalog = _catalog
+    if catalog[0] == version:
+        return catalog
+    with _lock:
+        if _catalog[0] != version:
+            _catalog = (
+                version,
+                tuple(Domain.objects.order_by('pk')),
+                tuple(Tag.objects.order_by('pk')),
+            )
+        return _catalog
+
+
+def get_domains():
+    """All domains."""
+    return _load()[1]
+
+
+def get_tags():
+    """All tags."""
+    return _load()[2]
+
+
+def domain_names():
+    """{domain_id: name}"""
+    return {domain.id: domain.name for domain in get_domains()}
+
+
+def domain_choices(empty_label='---------'):
+    """Choices for a Domain select, matching ModelChoiceField's rendering."""
+    choices = [(domain.pk, str(domain)) for domain in get_domains()]
+    return [('', empty_label)] + choices if empty_label is not None else choices
+
+
+def tag_choices():
+    """Choices for a Tag multi-select."""
+    return [(tag.pk, str(tag)) for tag in get_tags()]
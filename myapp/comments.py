@@ -0,0 +1,49 @@
+# myapp/comments.py
+
+"""
+Comment previews for feed cards
+- load_comment_previews() fetches at most N recent comments per project in one
+  query (ROW_NUMBER() partitioned by project), never a project's full thread
+- Project.comments_count is denormalized and kept in sync by Comment signals,
+  so cards show the total without counting or loading comments
+"""
+
+from django.conf import settings
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import Comment, Project
+
+
+FEED_COMMENT_PREVIEWS = getattr(settings, 'FEED_COMMENT_PREVIEWS', 3)
+
+
+def load_comment_previews(projects, limit=FEED_COMMENT_PREVIEWS):
+    """
+    Attach `comment_previews` (newest first, at most `limit`, users loaded) to
+    each project. One query regardless of how many comments the projects have.
+    """
+    projects = list(projects)
+    previews = {project.id: [] for project in projects}
+    if previews and limit > 0:
+        comments = (
+            Comment.objects.filter(project_id__in=previews)
+            .select_related('user')
+            .annotate(row_number=Window(
+                RowNumber(),
+                partition_by=F('project_id'),
+                order_by=[F('created_at').desc(), F('id').desc()],
+            ))
+            .filter(row_number__lte=limit)
+            .order_by('project_id', 'row_number')
+        )
+        for comment in comments:
+            previews[comment.project_id].append(comment)
+    for project in projects:
+        project.comment_previews = previews[project.id]
+    return projects
+
+
+def adjust_comments_count(project_id, delta):
+    """Atomically add delta to a project's denormalized comment count."""
+    Project.objects.filter(id=project_id).update(comments_count=F('comments_count') + delta)
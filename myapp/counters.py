@@ -0,0 +1,159 @@
+# myapp/counters.py
+
+"""
+Write-behind project view counter
+- project_detail only increments a counter in a shared store; no row write on
+  the request path and no read-modify-write
+- Stores: 'memory' (per-process dict, flushed by a background thread every
+  VIEW_COUNTER_FLUSH_INTERVAL seconds) and 'redis' (a hash in REDIS_URL or
+  any Redis-compatible server, flushed by the flush_view_counts beat task)
+- A flush drains the store atomically and applies the deltas with grouped
+  F() updates to views_count, the hourly engagement buckets and the feed
+  popularity feature; if the database write fails the deltas are put back
+"""
+
+import atexit
+import logging
+import threading
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .flushers import BackgroundFlusher
+from .models import Project
+from .project_features import refresh_popularity_for
+from .trending import add_engagement, hour_start
+
+
+VIEW_COUNTER_BACKEND = getattr(settings, 'VIEW_COUNTER_BACKEND', '')
+VIEW_COUNTER_FLUSH_INTERVAL = getattr(settings, 'VIEW_COUNTER_FLUSH_INTERVAL', 10)
+VIEW_COUNTER_KEY = 'counters:project_views'
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCounterStore:
+    """Process-local counters; each worker flushes its own."""
+
+    flushes_in_process = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(int)
+
+    def incr(self, field, amount=1):
+        with self._lock:
+            self._counts[field] += amount
+
+    def add_many(self, counts):
+        with self._lock:
+            for field, amount in counts.items():
+                self._counts[field] += amount
+
+    def drain(self):
+        with self._lock:
+            counts, self._counts = dict(self._counts), defaultdict(int)
+        return counts
+
+
+class RedisCounterStore:
+    """Counters in one Redis hash shared by every worker."""
+
+    flushes_in_process = False
+
+    def __init__(self, url, key=VIEW_COUNTER_KEY):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.key = key
+
+    def incr(self, field, amount=1):
+        self.client.hincrby(self.key, field, amount)
+
+    def add_many(self, counts):
+        pipe = self.client.pipeline()
+        for field, amount in counts.items():
+            pipe.hincrby(self.key, field, amount)
+        pipe.execute()
+
+    def drain(self):
+        # Rename first so increments arriving during the flush land in a fresh hash
+        import redis
+
+        draining = f'{self.key}:draining:{uuid.uuid4().hex}'
+        try:
+            self.client.rename(self.key, draining)
+        except redis.ResponseError:
+            return {}  # nothing pending
+        pipe = self.client.pipeline()
+        pipe.hgetall(draining)
+        pipe.delete(draining)
+        counts, _ = pipe.execute()
+        return {field.decode(): int(amount) for field, amount in counts.items()}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_counter_store():
+    """The configured store (redis when REDIS_URL is set unless overridden), created once."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                backend = VIEW_COUNTER_BACKEND or ('redis' if getattr(settings, 'REDIS_URL', '') else 'memory')
+                if backend == 'redis':
+                    _store = RedisCounterStore(settings.REDIS_URL)
+                else:
+                    _store = MemoryCounterStore()
+                    atexit.register(flush_view_counts)
+    return _store
+
+
+def record_view(project_id, at=None):
+    """Count one project view; the database sees it on the next flush."""
+    store = get_counter_store()
+    store.incr(f'{project_id}:{int(hour_start(at).timestamp())}')
+    if store.flushes_in_process:
+        _flusher.ensure_started()
+
+
+def flush_view_counts():
+    """Apply pending view counts to the database. Returns the number of projects updated."""
+    store = get_counter_store()
+    pending = store.drain()
+    if not pending:
+        return 0
+    totals = defaultdict(int)
+    hourly = {}
+    for field, amount in pending.items():
+        project_id, hour = (int(part) for part in field.split(':'))
+        totals[project_id] += amount
+        hourly[(project_id, datetime.fromtimestamp(hour, tz=dt_timezone.utc))] = amount
+    # Views of projects deleted since are dropped
+    existing = set(Project.objects.filter(id__in=list(totals)).values_list('id', flat=True))
+    totals = {project_id: amount for project_id, amount in totals.items() if project_id in existing}
+    hourly = {key: amount for key, amount in hourly.items() if key[0] in existing}
+    by_delta = defaultdict(list)
+    for project_id, amount in totals.items():
+        by_delta[amount].append(project_id)
+    try:
+        with transaction.atomic():
+            for amount, project_ids in by_delta.items():
+                Project.objects.filter(id__in=project_ids).update(views_count=F('views_count') + amount)
+            add_engagement('views', hourly)
+            refresh_popularity_for(list(totals))
+    except Exception:
+        # Nothing was written; keep the counts for the next flush
+        logger.exception("view counter flush failed; %d counters re-queued", len(pending))
+        store.add_many(pending)
+        return 0
+    return len(totals)
+
+
+_flusher = BackgroundFlusher('view-counter-flusher', flush_view_counts, VIEW_COUNTER_FLUSH_INTERVAL)
@@ -0,0 +1,257 @@
+# myapp/embeddings.py
+
+"""
+Embeddings for TRENDMIA
+- Providers: Gemini (remote) and a deterministic local hashing model (offline)
+- Batched client with bounded concurrency that keeps input order
+- In-process LRU in front of a DB-backed store
+- Keyed by embedding model name + SHA-256 of the input text
+- Rows remember which user/project produced them so edits can invalidate them
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .models import EmbeddingCache
+
+
+EMBEDDING_PROVIDER = getattr(settings, 'EMBEDDING_PROVIDER', 'gemini')
+EMBEDDING_MODEL = getattr(settings, 'EMBEDDING_MODEL', 'text-embedding-004')
+EMBEDDING_DIMENSIONS = getattr(settings, 'EMBEDDING_DIMENSIONS', 256)
+EMBEDDING_BATCH_SIZE = getattr(settings, 'EMBEDDING_BATCH_SIZE', 100)
+EMBEDDING_MAX_CONCURRENCY = getattr(settings, 'EMBEDDING_MAX_CONCURRENCY', 4)
+EMBEDDING_CACHE_SIZE = getattr(settings, 'EMBEDDING_CACHE_SIZE', 4096)
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+
+# ==================== PROVIDERS ====================
+
+class GeminiEmbeddingProvider:
+    """Gemini embed_content; one request embeds a whole batch of texts."""
+
+    def __init__(self, model=EMBEDDING_MODEL):
+        self.model_name = model
+
+    def embed_batch(self, texts):
+        from .ai_utils import _get_gemini_client
+
+        client = _get_gemini_client()
+        if not client:
+            return [None] * len(texts)
+        try:
+            result = client.models.embed_content(model=self.model_name, contents=list(texts))
+            vectors = [list(e.values) for e in result.embeddings]
+        except Exception:
+            return [None] * len(texts)
+        if len(vectors) != len(texts):
+            return [None] * len(texts)
+        return vectors
+
+
+class LocalEmbeddingProvider:
+    """
+    Deterministic offline stand-in: signed feature hashing of word unigrams and
+    bigrams, L2-normalized. Same text -> same vector in every process.
+    latency simulates a per-request round trip (seconds) for benchmarking.
+    """
+
+    def __init__(self, dimensions=EMBEDDING_DIMENSIONS, latency=0.0):
+        self.dimensions = dimensions
+        self.latency = latency
+        self.model_name = f'local-hash-{dimensions}'
+
+    def _embed_one(self, text):
+        vector = [0.0] * self.dimensions
+        tokens = _TOKEN_RE.findall((text or "").lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], 'little') % self.dimensions
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0:
+            return None
+        return [v / norm for v in vector]
+
+    def embed_batch(self, texts):
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._embed_one(text) for text in texts]
+
+
+def get_embedding_provider(name=None):
+    name = (name or EMBEDDING_PROVIDER).lower()
+    if name == 'local':
+        return LocalEmbeddingProvider()
+    return GeminiEmbeddingProvider()
+
+
+# ==================== BATCHED CLIENT ====================
+
+class EmbeddingClient:
+    """Splits texts into provider batches, runs up to max_concurrency at once, keeps input order."""
+
+    def __init__(self, provider, batch_size=EMBEDDING_BATCH_SIZE, max_concurrency=EMBEDDING_MAX_CONCURRENCY):
+        self.provider = provider
+        self.batch_size = max(1, int(batch_size))
+        self.max_concurrency = max(1, int(max_concurrency))
+
+    @property
+    def model_name(self):
+        return self.provider.model_name
+
+    def embed(self, texts):
+        texts = list(texts)
+        if not texts:
+            return []
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) == 1 or self.max_concurrency == 1:
+            results = [self.provider.embed_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+                results = list(pool.map(self.provider.embed_batch, batches))
+        return [vector for batch_result in results for vector in batch_result]
+
+
+_client = None
+
+
+def get_embedding_client():
+    """Process-wide client for the configured provider."""
+    global _client
+    if _client is None:
+        _client = EmbeddingClient(get_embedding_provider())
+    return _client
+
+
+# ==================== CACHE ====================
+
+def content_hash(text):
+    return hashlib.sha256((text or "").encode('utf-8')).hexdigest()
+
+
+def pack_vector(vector):
+    """Store vectors as compact float32 bytes."""
+    return array('f', vector).tobytes()
+
+
+def unpack_vector(blob):
+    values = array('f')
+    values.frombytes(bytes(blob))
+    return values.tolist()
+
+
+class _LRUCache:
+    """Small thread-safe LRU keyed by (model, content_hash)."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_memory_cache = _LRUCache(EMBEDDING_CACHE_SIZE)
+
+
+def get_cached_embeddings(texts, sources=None, client=None):
+    """
+    Embeddings for texts in input order (None where unavailable). Each text is
+    looked up in the in-process LRU, then the DB store; all remaining misses go
+    to the provider in batches. sources is an optional list of
+    ('user' | 'project', id) pairs, parallel to texts, used for invalidation.
+    """
+    client = client or get_embedding_client()
+    model = client.model_name
+    texts = list(texts)
+    sources = list(sources) if sources is not None else [None] * len(texts)
+    results = [None] * len(texts)
+
+    pending = {}  # content hash -> input positions still unresolved
+    for position, text in enumerate(texts):
+        if not text:
+            continue
+        digest = content_hash(text)
+        vector = _memory_cache.get((model, digest))
+        if vector is not None:
+            results[position] = vector
+        else:
+            pending.setdefault(digest, []).append(position)
+    if not pending:
+        return results
+
+    stored = EmbeddingCache.objects.filter(model_name=model, content_hash__in=list(pending))
+    for digest, blob in stored.values_list('content_hash', 'vector'):
+        vector = unpack_vector(blob)
+        _memory_cache.set((model, digest), vector)
+        for position in pending.pop(digest):
+            results[position] = vector
+    if not pending:
+        return results
+
+    digests = list(pending)
+    vectors = client.embed([texts[pending[digest][0]] for digest in digests])
+    new_rows = []
+    for digest, vector in zip(digests, vectors):
+        if not vector:
+            continue
+        positions = pending[digest]
+        source_type, source_id = sources[positions[0]] or ('', None)
+        new_rows.append(EmbeddingCache(
+            model_name=model,
+            content_hash=digest,
+            vector=pack_vector(vector),
+            source_type=source_type,
+            source_id=source_id,
+        ))
+        _memory_cache.set((model, digest), vector)
+        for position in positions:
+            results[position] = vector
+    if new_rows:
+        EmbeddingCache.objects.bulk_create(new_rows, ignore_conflicts=True)
+    return results
+
+
+def get_cached_embedding(text, source=None, client=None):
+    """Single-text convenience wrapper around get_cached_embeddings."""
+    if not text:
+        return None
+    return get_cached_embeddings([text], [source], client=client)[0]
+
+
+def invalidate_source(source_type, source_id):
+    """Drop every cached embedding produced for a user or project."""
+    rows = EmbeddingCache.objects.filter(source_type=source_type, source_id=source_id)
+    for model_name, digest in rows.values_list('model_name', 'content_hash'):
+        _memory_cache.discard((model_name, digest))
+    rows.delete()
@@ -0,0 +1,87 @@
+# myapp/feed_cache.py
+
+"""
+Per-user ranked feed cache
+- The hybrid feed ranking (ids + scores + reasons) is cached per user and
+  filter variant for FEED_CACHE_TTL seconds
+- Each user has a generation token in the key; follows, likes and new posts
+  from followed creators replace it, which orphans every cached ranking at once
+- Pages are served by slicing the cached ranking and loading only that page;
+  the key suffix doubles as the snapshot id carried by ranked-feed cursors
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .ai_utils import get_hybrid_feed_projects
+from .models import Project
+
+
+FEED_CACHE_TTL = getattr(settings, 'FEED_CACHE_TTL', 300)
+# Projects ranked (and cached) per feed request
+FEED_RANK_LIMIT = getattr(settings, 'FEED_RANK_LIMIT', 120)
+
+
+def _generation_key(user_id):
+    return f'feed:gen:{user_id}'
+
+
+def _generation(user_id):
+    key = _generation_key(user_id)
+    token = cache.get(key)
+    if token is None:
+        cache.add(key, time.time_ns(), None)
+        token = cache.get(key)
+    return token
+
+
+def invalidate_user_feeds(user_ids):
+    """Drop cached rankings for these users (one cache round trip)."""
+    token = time.time_ns()
+    keys = {_generation_key(user_id): token for user_id in set(user_ids) if user_id}
+    if keys:
+        cache.set_many(keys, None)
+
+
+def get_ranked_feed(user, base_queryset, variant='', snapshot_id=None):
+    """
+    (snapshot id, ranked feed entries [(project_id, score, reasons)]), best first.
+    variant distinguishes base querysets (e.g. a search term) for the same user.
+    Passing a snapshot id returns that exact ranking while it is still cached,
+    even after invalidation, so cursor pagination doesn't shift under the reader.
+    """
+    if snapshot_id:
+        entries = cache.get(f'feed:ranked:{user.id}:{snapshot_id}')
+        if entries is not None:
+            return snapshot_id, entries
+    digest = hashlib.sha1(variant.encode('utf-8')).hexdigest()[:16]
+    snapshot_id = f'{_generation(user.id)}.{digest}'
+    key = f'feed:ranked:{user.id}:{snapshot_id}'
+    entries = cache.get(key)
+    if entries is None:
+        projects = get_hybrid_feed_projects(user, base_queryset=base_queryset, limit=FEED_RANK_LIMIT)
+        entries = [(p.id, p.ai_feed_score, p.ai_feed_reasons) for p in projects]
+        cache.set(key, entries, FEED_CACHE_TTL)
+    return snapshot_id, entries
+
+
+def hydrate_feed_entries(entries):
+    """Projects for a slice of ranked entries, with ai_feed_score/ai_feed_reasons set."""
+    entries = list(entries)
+    projects = (
+        Project.objects.select_related('user', 'domain')
+        .prefetch_related('tags')
+        .in_bulk([project_id for project_id, _, _ in entries])
+    )
+    hydrated = []
+    for project_id, score, reasons in entries:
+        project = projects.get(project_id)
+        if project is None:
+            continue  # deleted since the ranking was cached
+        project.ai_feed_score = score
+        project.ai_feed_reasons = reasons
+        hydrated.append(project)
+    return hydrated
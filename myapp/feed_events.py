@@ -0,0 +1,89 @@
+# myapp/feed_events.py
+
+"""
+Feed impression/click/like event log
+- Request handlers only append tuples to an in-process buffer (a deque append,
+  microseconds); nothing touches the database on the request path
+- A daemon thread per process writes the buffer to FeedEvent with bulk_create
+  in FEED_EVENT_BATCH_SIZE batches, every FEED_EVENT_FLUSH_INTERVAL seconds
+  or as soon as a batch is full, and once more at exit
+- Events carry their own timestamp, surface and (for impressions) position and
+  ranker score, so offline evaluation can join impressions to clicks and likes
+- The buffer is bounded: if the database is unavailable for long, the oldest
+  events are dropped instead of growing the process without limit
+"""
+
+import atexit
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.utils import timezone
+
+from .flushers import BackgroundFlusher
+from .models import FeedEvent
+
+
+FEED_EVENT_BATCH_SIZE = getattr(settings, 'FEED_EVENT_BATCH_SIZE', 500)
+FEED_EVENT_FLUSH_INTERVAL = getattr(settings, 'FEED_EVENT_FLUSH_INTERVAL', 5)
+FEED_EVENT_MAX_BUFFER = 50000
+# Values of the ?ref= parameter feed links carry to project pages and likes
+FEED_SURFACES = ('feed', 'enhanced_feed', 'feed_recs')
+
+# (user_id, project_id, kind, surface, position, score, created_at)
+_buffer = deque(maxlen=FEED_EVENT_MAX_BUFFER)
+_flush_lock = threading.Lock()
+
+
+def _append(rows):
+    _buffer.extend(rows)
+    _flusher.ensure_started()
+    if len(_buffer) >= FEED_EVENT_BATCH_SIZE:
+        _flusher.wake()
+
+
+def feed_surface(ref):
+    """The feed surface named by a ?ref= value, or '' for anything else."""
+    return ref if ref in FEED_SURFACES else ''
+
+
+def log_impressions(user_id, surface, projects):
+    """One impression per project shown, in page order (ai_feed_score is logged when set)."""
+    now = timezone.now()
+    _append(
+        (user_id, project.id, 'impression', surface, position, getattr(project, 'ai_feed_score', None), now)
+        for position, project in enumerate(projects)
+    )
+
+
+def log_feed_event(user_id, kind, project_id, surface=''):
+    """A click or like on one project."""
+    _append([(user_id, project_id, kind, surface, None, None, timezone.now())])
+
+
+def flush_feed_events():
+    """Write buffered events in batches. Returns the number written."""
+    written = 0
+    with _flush_lock:
+        while _buffer:
+            batch = []
+            while _buffer and len(batch) < FEED_EVENT_BATCH_SIZE:
+                batch.append(_buffer.popleft())
+            try:
+                FeedEvent.objects.bulk_create([
+                    FeedEvent(
+                        user_id=user_id, project_id=project_id, kind=kind, surface=surface,
+                        position=position, score=score, created_at=created_at,
+                    )
+                    for user_id, project_id, kind, surface, position, score, created_at in batch
+                ])
+            except Exception:
+                # Keep the batch (oldest first) for the next attempt
+                _buffer.extendleft(reversed(batch))
+                raise
+            written += len(batch)
+    return written
+
+
+_flusher = BackgroundFlusher('feed-event-flusher', flush_feed_events, FEED_EVENT_FLUSH_INTERVAL)
+atexit.register(flush_feed_events)
@@ -0,0 +1,51 @@
+# myapp/flushers.py
+
+"""
+Per-process background flush threads for write-behind buffers
+- Request handlers only touch an in-memory buffer and call ensure_started();
+  the daemon thread runs the flush every `interval` seconds or when woken
+- Started lazily and per pid: forked workers don't inherit the parent's thread
+"""
+
+import logging
+import os
+import threading
+
+from django.db import close_old_connections
+
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundFlusher:
+    """Runs flush() in a daemon thread every `interval` seconds, or sooner when woken."""
+
+    def __init__(self, name, flush, interval):
+        self.name = name
+        self.flush = flush
+        self.interval = interval
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                threading.Thread(target=self._run, name=self.name, daemon=True).start()
+                self._pid = os.getpid()
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("%s flush failed", self.name)
+            finally:
+                close_old_connections()
@@ -6,6 +6,7 @@ from .models import (
     CustomUser, Project, CollaborationRequest, WorkspaceNote, Task,
     WorkspaceFile, Milestone, Comment, Community, ProjectTemplate
 )
+from .catalog import domain_choices, tag_choices
 
 # Skill levels for user skills
 SKILL_LEVELS = [
@@ -130,6 +131,12 @@ class ProjectForm(forms.ModelForm):
             'cover_image': forms.FileInput(attrs={'class': 'form-control'}),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Render options from the cached catalog; submitted values are still validated against the DB
+        self.fields['domain'].choices = domain_choices()
+        self.fields['tags'].choices = tag_choices()
+
     def clean_skills_required(self):
         skills = self.cleaned_data.get('skills_required', '')
         if skills:
@@ -0,0 +1,82 @@
+# myapp/likes.py
+
+"""
+Project likes
+- toggle_like() flips a user's like with a delete-or-insert on the Like row
+  and adjusts Project.likes_count with a DB-side F() expression, so concurrent
+  toggles on a hot project never overwrite each other's counts; the feed
+  popularity feature is refreshed once the toggle commits
+- reconcile_like_counts() (periodic) recomputes likes_count from Like rows in
+  id batches and repairs any drift
+"""
+
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Like, Project
+from .project_features import refresh_popularity_for
+
+
+LIKE_RECONCILE_BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def toggle_like(project_id, user):
+    """
+    Like the project, or unlike it if already liked.
+    Returns (liked, likes_count after the toggle).
+    """
+    projects = Project.objects.filter(id=project_id)
+    # The counter UPDATE is the last statement, so the row lock is held only until commit
+    with transaction.atomic():
+        deleted, _ = Like.objects.filter(project_id=project_id, user=user).delete()
+        if deleted:
+            liked, delta = False, -1
+        else:
+            try:
+                with transaction.atomic():
+                    Like.objects.create(project_id=project_id, user=user)
+                liked, delta = True, 1
+            except IntegrityError:
+                # A concurrent request from the same user already liked it
+                liked, delta = True, 0
+        if delta:
+            projects.update(likes_count=F('likes_count') + delta)
+            # Queryset updates fire no post_save, so refresh the feed popularity feature here
+            transaction.on_commit(lambda: refresh_popularity_for([project_id]))
+    return liked, max(projects.values_list('likes_count', flat=True).first() or 0, 0)
+
+
+def reconcile_like_counts(batch_size=LIKE_RECONCILE_BATCH_SIZE):
+    """
+    Set likes_count to the number of Like rows wherever they disagree, one
+    batch of project ids at a time. Returns the number of projects repaired.
+    """
+    like_counts = (
+        Like.objects.filter(project_id=OuterRef('pk'))
+        .order_by().values('project_id').annotate(n=Count('id')).values('n')
+    )
+    repaired = 0
+    last_id = 0
+    while True:
+        batch = list(
+            Project.objects.filter(id__gt=last_id).order_by('id')
+            .annotate(actual=Coalesce(Subquery(like_counts), 0))
+            .values_list('id', 'likes_count', 'actual')[:batch_size]
+        )
+        if not batch:
+            break
+        last_id = batch[-1][0]
+        drifted = [project_id for project_id, stored, actual in batch if stored != actual]
+        if drifted:
+            # Recount at write time, so toggles committed since the read aren't overwritten
+            Project.objects.filter(id__in=drifted).update(likes_count=Coalesce(Subquery(like_counts), 0))
+            refresh_popularity_for(drifted)
+            repaired += len(drifted)
+    if repaired:
+        logger.info("like reconcile: repaired likes_count on %d projects", repaired)
+    return repaired
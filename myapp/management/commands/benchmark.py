@@ -0,0 +1,145 @@
+"""
+Management command for offline performance benchmarks
+Run: python manage.py benchmark embeddings|scoring|startup
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import textwrap
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from myapp.embeddings import EmbeddingClient, LocalEmbeddingProvider
+from myapp.scoring import COLLABORATOR_WEIGHTS, top_k, weighted_scores
+
+
+SAMPLE_WORDS = (
+    'python django react machine learning data pipeline robotics sensor vision '
+    'mobile flutter kotlin blockchain solidity design figma research iot arduino '
+    'cloud docker kubernetes api graphql security cryptography analytics'
+).split()
+
+# Optional/heavy packages that must not be imported just by loading the URLconf
+HEAVY_MODULES = ('pandas', 'matplotlib', 'seaborn', 'ipywidgets', 'supabase')
+
+# Runs in a fresh interpreter: cold import of Django + every view module
+STARTUP_SCRIPT = textwrap.dedent("""
+    import json, resource, sys, time
+    start = time.perf_counter()
+    import django
+    django.setup()
+    import myapp.urls
+    seconds = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        'seconds': seconds,
+        'rss_mb': rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024,
+        'heavy': [name for name in %r if name in sys.modules],
+    }))
+""") % (HEAVY_MODULES,)
+
+
+def _sample_texts(count):
+    texts = []
+    for i in range(count):
+        words = [SAMPLE_WORDS[(i * 7 + j * 3) % len(SAMPLE_WORDS)] for j in range(12)]
+        texts.append(f"profile {i} " + " ".join(words))
+    return texts
+
+
+class Command(BaseCommand):
+    help = 'Run offline performance benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', choices=['embeddings', 'scoring', 'startup'])
+        parser.add_argument('--count', type=int, default=1000, help='Number of items to process')
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--latency-ms', type=float, default=20.0, help='Simulated round trip per provider request')
+        parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to start (startup)')
+        parser.add_argument('--budget-ms', type=float, default=None, help='Fail if median startup exceeds this (startup)')
+
+    def handle(self, *args, **options):
+        getattr(self, f"bench_{options['target']}")(options)
+
+    def _report(self, label, seconds, count):
+        self.stdout.write(f"{label:<28} {seconds * 1000:10.1f} ms  ({count / seconds if seconds else 0:,.0f} items/s)")
+
+    def bench_embeddings(self, options):
+        """Per-text requests vs batched + concurrent requests against the local provider."""
+        texts = _sample_texts(options['count'])
+        provider = LocalEmbeddingProvider(latency=options['latency_ms'] / 1000.0)
+
+        start = time.perf_counter()
+        one_by_one = [provider.embed_batch([text])[0] for text in texts]
+        self._report('one request per text', time.perf_counter() - start, len(texts))
+
+        client = EmbeddingClient(provider, batch_size=options['batch_size'], max_concurrency=options['concurrency'])
+        start = time.perf_counter()
+        batched = client.embed(texts)
+        self._report(
+            f"batched ({client.batch_size} x {client.max_concurrency})",
+            time.perf_counter() - start, len(texts),
+        )
+
+        if batched != one_by_one:
+            self.stderr.write(self.style.ERROR('Batched vectors differ from per-text vectors'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Batched output matches per-text output in input order'))
+
+    def bench_scoring(self, options):
+        """Per-candidate Python weighted sums + full sort vs one matrix-vector product + argpartition."""
+        count = options['count']
+        rng = np.random.default_rng(42)
+        features = rng.random((count, len(COLLABORATOR_WEIGHTS)))
+        weights = COLLABORATOR_WEIGHTS.tolist()
+        rows = features.tolist()
+
+        start = time.perf_counter()
+        scored = [
+            (sum(value * weight for value, weight in zip(row, weights)), index)
+            for index, row in enumerate(rows)
+        ]
+        scored = [item for item in scored if item[0] > 0.2]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        legacy = [index for _, index in scored[:10]]
+        self._report('python loop + sort', time.perf_counter() - start, count)
+
+        start = time.perf_counter()
+        vectorized = top_k(weighted_scores(features, COLLABORATOR_WEIGHTS), 10, min_score=0.2).tolist()
+        self._report('matrix product + argpartition', time.perf_counter() - start, count)
+
+        if legacy != vectorized:
+            self.stderr.write(self.style.ERROR('Top-K differs between scoring paths'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Top-K matches'))
+
+    def bench_startup(self, options):
+        """Cold import time and peak RSS of django.setup() + the URLconf, in fresh interpreters."""
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'myproject.settings'))
+        samples = []
+        for _ in range(options['runs']):
+            result = subprocess.run(
+                [sys.executable, '-c', STARTUP_SCRIPT],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+            )
+            if result.returncode != 0:
+                raise CommandError(f'Startup run failed:\n{result.stderr}')
+            samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+        times = [sample['seconds'] * 1000 for sample in samples]
+        median = statistics.median(times)
+        self.stdout.write(f"{'import time (median)':<28} {median:10.1f} ms  (min {min(times):.1f}, max {max(times):.1f})")
+        self.stdout.write(f"{'peak RSS (max)':<28} {max(sample['rss_mb'] for sample in samples):10.1f} MB")
+
+        heavy = sorted({name for sample in samples for name in sample['heavy']})
+        if heavy:
+            self.stderr.write(self.style.WARNING(f"Heavy modules imported at startup: {', '.join(heavy)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS('No heavy optional modules imported at startup'))
+        if options['budget_ms'] is not None and median > options['budget_ms']:
+            raise CommandError(f"Median startup {median:.1f} ms exceeds budget {options['budget_ms']:.1f} ms")
@@ -0,0 +1,31 @@
+"""
+Management command to drain the recommendation dirty queue (or show its depth and lag)
+Run: python manage.py process_recommendation_queue [--stats]
+"""
+from django.core.management.base import BaseCommand
+
+from myapp.recommendation_queue import RECOMMENDATION_QUEUE_BATCH, process_dirty_queue, queue_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute AIRecommendation rows for users/projects changed since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stats', action='store_true', help='Only print queue depth and lag')
+        parser.add_argument('--batch-size', type=int, default=RECOMMENDATION_QUEUE_BATCH)
+        parser.add_argument('--drain', action='store_true', help='Keep processing until the queue is empty')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            stats = queue_stats()
+            self.stdout.write(f"depth={stats['depth']} oldest_lag={stats['oldest_lag_seconds']:.1f}s")
+            return
+        while True:
+            result = process_dirty_queue(max_items=options['batch_size'])
+            if result['entries']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Processed {result['entries']} entries ({result['users']} users), "
+                    f"max lag {result['max_lag_seconds']:.1f}s, depth {result['depth']}"
+                ))
+            if not options['drain'] or not result['entries'] or not result['depth']:
+                break
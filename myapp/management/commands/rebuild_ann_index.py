@@ -0,0 +1,24 @@
+"""
+Management command to rebuild the approximate nearest-neighbour indexes over user/project embeddings
+Run: python manage.py rebuild_ann_index [--target users|projects|all]
+"""
+from django.core.management.base import BaseCommand
+
+from myapp.ann_queue import ANN_REBUILD_CHUNK_SIZE, rebuild_ann_indexes
+
+
+class Command(BaseCommand):
+    help = 'Re-embed users/projects (through the embedding cache) and rebuild their ANN indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=['users', 'projects', 'all'], default='all')
+        parser.add_argument('--chunk-size', type=int, default=ANN_REBUILD_CHUNK_SIZE)
+        parser.add_argument('--nlist', type=int, default=None,
+                            help='Number of IVF lists (default: sqrt of item count)')
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_ann_indexes(options['target'], options['chunk_size'], options['nlist'])
+        for name, index in rebuilt.items():
+            self.stdout.write(self.style.SUCCESS(
+                f'Indexed {len(index)} {name} into {len(index.centroids)} lists'
+            ))
@@ -0,0 +1,17 @@
+"""
+Management command to recompute the precomputed feed ranking features for every project
+Run: python manage.py rebuild_project_features
+"""
+from django.core.management.base import BaseCommand
+from myapp.project_features import rebuild_project_features
+
+
+class Command(BaseCommand):
+    help = 'Rebuild ProjectFeatures (token/tag/skill sets, popularity) for all projects'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        written = rebuild_project_features(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Refreshed features for {written} projects'))
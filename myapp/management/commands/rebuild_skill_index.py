@@ -0,0 +1,17 @@
+"""
+Management command to rebuild the inverted skill index used for collaborator matching
+Run: python manage.py rebuild_skill_index
+"""
+from django.core.management.base import BaseCommand
+from myapp.skill_index import rebuild_skill_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the UserSkill index from CustomUser.skills'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        written = rebuild_skill_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {written} user skills'))
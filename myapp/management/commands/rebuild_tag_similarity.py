@@ -0,0 +1,21 @@
+"""
+Management command to recompute the tag-to-tag similarity matrix
+Run: python manage.py rebuild_tag_similarity [--dirty]
+"""
+from django.core.management.base import BaseCommand
+from myapp.tag_similarity import refresh_dirty_tag_similarity, refresh_tag_similarity
+
+
+class Command(BaseCommand):
+    help = 'Rebuild TagSimilarity (lexical match + co-occurrence) for every tag pair'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dirty', action='store_true', help='Only recompute tags queued as changed')
+
+    def handle(self, *args, **options):
+        if options['dirty']:
+            result = refresh_dirty_tag_similarity()
+            self.stdout.write(self.style.SUCCESS(f"Recomputed {result['tags']} dirty tags ({result['rows']} rows)"))
+            return
+        written = refresh_tag_similarity()
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} tag similarity rows'))
@@ -0,0 +1,14 @@
+"""
+Management command to recompute the monthly tag rollup behind the trending page
+Run: python manage.py rebuild_tag_trends
+"""
+from django.core.management.base import BaseCommand
+from myapp.tag_trends import rebuild_tag_monthly_counts
+
+
+class Command(BaseCommand):
+    help = 'Rebuild TagMonthlyCount from the project and tag tables'
+
+    def handle(self, *args, **options):
+        written = rebuild_tag_monthly_counts()
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} tag/month counts'))
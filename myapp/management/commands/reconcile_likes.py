@@ -0,0 +1,17 @@
+"""
+Management command to repair Project.likes_count from the Like rows
+Run: python manage.py reconcile_likes [--batch-size 1000]
+"""
+from django.core.management.base import BaseCommand
+from myapp.likes import LIKE_RECONCILE_BATCH_SIZE, reconcile_like_counts
+
+
+class Command(BaseCommand):
+    help = 'Reconcile likes_count against Like rows in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=LIKE_RECONCILE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        repaired = reconcile_like_counts(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Repaired likes_count on {repaired} projects'))
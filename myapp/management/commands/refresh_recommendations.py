@@ -0,0 +1,32 @@
+"""
+Management command to precompute project recommendations into AIRecommendation
+Run: python manage.py refresh_recommendations [--user USERNAME]
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.models import CustomUser
+from myapp.recommender import (
+    RECOMMENDATION_BATCH_SIZE, RECOMMENDATIONS_PER_USER, refresh_all_recommendations, write_recommendations,
+)
+
+
+class Command(BaseCommand):
+    help = 'Score recommendable projects for every user and store the top-N in AIRecommendation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only refresh this username')
+        parser.add_argument('--limit', type=int, default=RECOMMENDATIONS_PER_USER)
+        parser.add_argument('--batch-size', type=int, default=RECOMMENDATION_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['user']:
+            user = CustomUser.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"User '{options['user']}' not found")
+            written = write_recommendations([user], limit=options['limit'])
+            self.stdout.write(self.style.SUCCESS(f'Stored {written} recommendations for {user.username}'))
+            return
+        processed, written = refresh_all_recommendations(
+            batch_size=options['batch_size'], limit=options['limit']
+        )
+        self.stdout.write(self.style.SUCCESS(f'Stored {written} recommendations for {processed} users'))
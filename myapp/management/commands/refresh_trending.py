@@ -0,0 +1,22 @@
+"""
+Management command to recompute time-decayed project trending scores
+Run: python manage.py refresh_trending [--full]
+"""
+from django.core.management.base import BaseCommand
+from myapp.trending import prune_engagement_buckets, refresh_changed_trending_scores, refresh_trending_scores
+
+
+class Command(BaseCommand):
+    help = 'Refresh ProjectTrendingScore from hourly engagement buckets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every project, not just those with new engagement')
+
+    def handle(self, *args, **options):
+        if options['full']:
+            result = {'projects': refresh_trending_scores(), 'pruned': prune_engagement_buckets()}
+        else:
+            result = refresh_changed_trending_scores()
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed {result['projects']} trending scores, pruned {result['pruned']} expired buckets"
+        ))
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_user_skills(apps, schema_editor):
+    CustomUser = apps.get_model('myapp', 'CustomUser')
+    UserSkill = apps.get_model('myapp', 'UserSkill')
+    rows = []
+    for user in CustomUser.objects.only('id', 'skills').iterator():
+        skills = user.skills if isinstance(user.skills, dict) else {}
+        names = {name.strip().lower()[:100] for name in skills if isinstance(name, str) and name.strip()}
+        rows.extend(UserSkill(user_id=user.id, skill=name) for name in names)
+    UserSkill.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0038_alter_airecommendation_score_alter_customuser_date_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(db_index=True, max_length=100)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_index', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('skill', 'user')},
+            },
+        ),
+        migrations.RunPython(backfill_user_skills, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0039_userskill'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmbeddingCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(max_length=100)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('vector', models.BinaryField(help_text='float32 vector bytes')),
+                ('source_type', models.CharField(blank=True, choices=[('user', 'User profile'), ('project', 'Project')], max_length=20)),
+                ('source_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['source_type', 'source_id'], name='myapp_embed_source__3fe67d_idx')],
+                'unique_together': {('model_name', 'content_hash')},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0040_embeddingcache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationDirty',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('user', 'User'), ('project', 'Project')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('enqueued_at', models.DateTimeField(help_text='First time the object was marked dirty')),
+                ('touched_at', models.DateTimeField(help_text='Last time the object was marked dirty')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['enqueued_at'], name='myapp_recom_enqueue_b7b7e9_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
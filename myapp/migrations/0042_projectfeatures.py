@@ -0,0 +1,25 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0041_recommendationdirty'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectFeatures',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='features', serialize=False, to='myapp.project')),
+                ('tokens', models.JSONField(default=list, help_text='Sorted token set of title, description, problem statement and skills')),
+                ('tags', models.JSONField(default=list, help_text='Sorted lower-cased tag names')),
+                ('skills', models.JSONField(default=list, help_text='Sorted lower-cased required skills')),
+                ('popularity', models.FloatField(default=0.0, help_text='Feed popularity in [0, 1] from likes and views')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
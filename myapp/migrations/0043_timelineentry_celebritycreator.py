@@ -0,0 +1,79 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_timelines(apps, schema_editor):
+    Follow = apps.get_model('myapp', 'Follow')
+    Project = apps.get_model('myapp', 'Project')
+    TimelineEntry = apps.get_model('myapp', 'TimelineEntry')
+    CelebrityCreator = apps.get_model('myapp', 'CelebrityCreator')
+    threshold = getattr(settings, 'TIMELINE_CELEBRITY_THRESHOLD', 10000)
+    backfill = getattr(settings, 'TIMELINE_BACKFILL', 50)
+
+    celebrities = set(
+        Follow.objects.values('following_id').annotate(n=models.Count('id'))
+        .filter(n__gte=threshold).values_list('following_id', flat=True)
+    )
+    CelebrityCreator.objects.bulk_create([CelebrityCreator(user_id=user_id) for user_id in celebrities])
+
+    recent = {}
+    rows = []
+    for follower_id, creator_id in Follow.objects.exclude(following_id__in=celebrities).values_list(
+        'follower_id', 'following_id'
+    ).iterator():
+        if creator_id not in recent:
+            recent[creator_id] = list(
+                Project.objects.filter(user_id=creator_id, visibility='public')
+                .order_by('-created_at').values_list('id', 'created_at')[:backfill]
+            )
+        rows.extend(
+            TimelineEntry(user_id=follower_id, project_id=project_id, author_id=creator_id, created_at=created_at)
+            for project_id, created_at in recent[creator_id]
+        )
+        if len(rows) >= 5000:
+            TimelineEntry.objects.bulk_create(rows, ignore_conflicts=True)
+            rows = []
+    TimelineEntry.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0042_projectfeatures'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CelebrityCreator',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='celebrity', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('since', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(help_text='Project creation time, for timeline ordering')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='myapp.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='timelineentry',
+            index=models.Index(fields=['user', '-created_at'], name='myapp_timel_user_id_6e4ba7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timelineentry',
+            index=models.Index(fields=['user', 'author'], name='myapp_timel_user_id_8b07ea_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='timelineentry',
+            unique_together={('user', 'project')},
+        ),
+        migrations.RunPython(backfill_timelines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:42
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_comments_count(apps, schema_editor):
+    Project = apps.get_model('myapp', 'Project')
+    Comment = apps.get_model('myapp', 'Comment')
+    counts = (
+        Comment.objects.filter(project_id=models.OuterRef('pk'))
+        .order_by().values('project_id').annotate(n=models.Count('id')).values('n')
+    )
+    Project.objects.update(comments_count=Coalesce(models.Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0043_timelineentry_celebritycreator'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='comments_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['project', '-created_at'], name='myapp_comme_project_ad9eda_idx'),
+        ),
+        migrations.RunPython(backfill_comments_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0044_project_comments_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text='Lexical match (1 / 0.5) plus weighted co-occurrence')),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_tags', to='myapp.tag')),
+                ('target', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='myapp.tag')),
+            ],
+            options={
+                'unique_together': {('source', 'target')},
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models.functions import TruncMonth
+
+
+def backfill_tag_monthly_counts(apps, schema_editor):
+    Project = apps.get_model('myapp', 'Project')
+    TagMonthlyCount = apps.get_model('myapp', 'TagMonthlyCount')
+    counts = (
+        Project.tags.through.objects
+        .annotate(month=TruncMonth('project__created_at', output_field=models.DateField()))
+        .values('tag_id', 'month').annotate(n=models.Count('id'))
+        .values_list('tag_id', 'month', 'n')
+    )
+    TagMonthlyCount.objects.bulk_create(
+        [TagMonthlyCount(tag_id=tag_id, month=month, count=n) for tag_id, month, n in counts],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0045_tagsimilarity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagMonthlyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month the projects were created in')),
+                ('count', models.IntegerField(default=0)),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_counts', to='myapp.tag')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='tagmonthlycount',
+            index=models.Index(fields=['month'], name='myapp_tagmo_month_821e8b_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='tagmonthlycount',
+            unique_together={('tag', 'month')},
+        ),
+        migrations.RunPython(backfill_tag_monthly_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0046_tagmonthlycount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectEngagementBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(help_text='Start of the hour the engagement happened in')),
+                ('views', models.IntegerField(default=0)),
+                ('likes', models.IntegerField(default=0)),
+                ('comments', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(help_text='Last increment; drives incremental score refreshes')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='engagement_buckets', to='myapp.project')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProjectTrendingScore',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='myapp.project')),
+                ('log_score', models.FloatField(db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='projectengagementbucket',
+            index=models.Index(fields=['updated_at'], name='myapp_proje_updated_cf7a62_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectengagementbucket',
+            index=models.Index(fields=['hour'], name='myapp_proje_hour_13c0f2_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='projectengagementbucket',
+            unique_together={('project', 'hour')},
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0047_project_engagement_trending'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectDailyViewerSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('registers', models.BinaryField()),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_viewer_sketches', to='myapp.project')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProjectViewerSketch',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='viewer_sketch', serialize=False, to='myapp.project')),
+                ('registers', models.BinaryField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='projectdailyviewersketch',
+            index=models.Index(fields=['day'], name='myapp_proje_day_d46251_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='projectdailyviewersketch',
+            unique_together={('project', 'day')},
+        ),
+    ]
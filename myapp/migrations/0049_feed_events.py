@@ -0,0 +1,40 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0048_project_viewer_sketches'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_id', models.BigIntegerField()),
+                ('kind', models.CharField(choices=[('impression', 'Impression'), ('click', 'Click'), ('like', 'Like')], max_length=12)),
+                ('surface', models.CharField(blank=True, help_text='Feed the project was shown in or opened from', max_length=20)),
+                ('position', models.PositiveSmallIntegerField(blank=True, help_text='Position on the page (impressions)', null=True)),
+                ('score', models.FloatField(blank=True, help_text='Ranker score when shown (impressions)', null=True)),
+                ('created_at', models.DateTimeField(help_text='When the event happened, not when it was flushed')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='feedevent',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='feedevent',
+            index=models.Index(fields=['kind', 'created_at'], name='myapp_feede_kind_e1782d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedevent',
+            index=models.Index(fields=['project_id', 'kind'], name='myapp_feede_project_a9cc94_idx'),
+        ),
+    ]
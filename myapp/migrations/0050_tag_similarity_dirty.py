@@ -0,0 +1,21 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0049_feed_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagSimilarityDirty',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='myapp.tag')),
+                ('touched_at', models.DateTimeField(help_text='Last time the tag was marked dirty')),
+            ],
+        ),
+    ]
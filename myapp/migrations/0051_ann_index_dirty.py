@@ -0,0 +1,26 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0050_tag_similarity_dirty'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnIndexDirty',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('user', 'User'), ('project', 'Project')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('touched_at', models.DateTimeField(help_text='Last time the object was marked dirty')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['touched_at'], name='myapp_annin_touched_8f2b40_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
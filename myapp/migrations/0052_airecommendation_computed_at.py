@@ -0,0 +1,25 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_computed_at(apps, schema_editor):
+    AIRecommendation = apps.get_model('myapp', 'AIRecommendation')
+    AIRecommendation.objects.update(computed_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0051_ann_index_dirty'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='airecommendation',
+            name='computed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='When the batch recommender last wrote this row'),
+        ),
+        migrations.RunPython(backfill_computed_at, migrations.RunPython.noop),
+    ]
@@ -134,6 +134,7 @@ class Project(models.Model):
     # Metrics
     views_count = models.IntegerField(default=0)
     likes_count = models.IntegerField(default=0)
+    comments_count = models.IntegerField(default=0)  # Denormalized; kept in sync by Comment signals
     
     class Meta:
         ordering = ['-created_at']
@@ -347,6 +348,33 @@ class Follow(models.Model):
         return f"{self.follower.username} follows {self.following.username}"
 
 
+class TimelineEntry(models.Model):
+    """Materialized home timeline: a followed creator's project pushed to a follower on write"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='timeline_entries')
+    project = models.ForeignKey('Project', on_delete=models.CASCADE, related_name='timeline_entries')
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    created_at = models.DateTimeField(help_text="Project creation time, for timeline ordering")
+
+    class Meta:
+        unique_together = ('user', 'project')
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['user', 'author']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} <- project {self.project_id}"
+
+
+class CelebrityCreator(models.Model):
+    """Creators above the fan-out follower threshold; followers read their projects at request time"""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='celebrity')
+    since = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Celebrity {self.user_id}"
+
+
 class Comment(models.Model):
     """Comments on projects"""
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='comments')
@@ -357,6 +385,7 @@ class Comment(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['project', '-created_at'])]
     
     def __str__(self):
         return f"Comment by {self.user.username} on {self.project.title}"
@@ -450,6 +479,7 @@ class AIRecommendation(models.Model):
     score = models.FloatField(validators=[MinValueValidator(0.0), MaxValueValidator(1.0)])
     reason = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    computed_at = models.DateTimeField(default=timezone.now, help_text="When the batch recommender last wrote this row")
     
     class Meta:
         unique_together = ('user', 'project')
@@ -459,6 +489,207 @@ class AIRecommendation(models.Model):
         return f"AI Rec: {self.user.username} -> {self.project.title} ({self.score:.2f})"
 
 
+class ProjectFeatures(models.Model):
+    """Precomputed ranking features for a project, refreshed on save and tag changes"""
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='features')
+    tokens = models.JSONField(default=list, help_text="Sorted token set of title, description, problem statement and skills")
+    tags = models.JSONField(default=list, help_text="Sorted lower-cased tag names")
+    skills = models.JSONField(default=list, help_text="Sorted lower-cased required skills")
+    popularity = models.FloatField(default=0.0, help_text="Feed popularity in [0, 1] from likes and views")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Features for project {self.project_id}"
+
+
+class TagSimilarity(models.Model):
+    """How strongly a user's interest in `source` recommends posts tagged `target` (non-zero pairs only)"""
+    source = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='similar_tags')
+    target = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField(help_text="Lexical match (1 / 0.5) plus weighted co-occurrence")
+
+    class Meta:
+        unique_together = ('source', 'target')
+
+    def __str__(self):
+        return f"{self.source_id} -> {self.target_id}: {self.score:.2f}"
+
+
+class TagSimilarityDirty(models.Model):
+    """Tags whose TagSimilarity rows need recomputing (one row per tag, drained by a beat task)"""
+    tag = models.OneToOneField(Tag, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    touched_at = models.DateTimeField(help_text="Last time the tag was marked dirty")
+
+    def __str__(self):
+        return f"Tag {self.tag_id} dirty since {self.touched_at:%Y-%m-%d %H:%M}"
+
+
+class TagMonthlyCount(models.Model):
+    """Rollup: projects created in a month that carry a tag (kept current by tag signals)"""
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='monthly_counts')
+    month = models.DateField(help_text="First day of the month the projects were created in")
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('tag', 'month')
+        indexes = [models.Index(fields=['month'])]
+
+    def __str__(self):
+        return f"{self.tag_id} {self.month:%Y-%m}: {self.count}"
+
+
+class ProjectEngagementBucket(models.Model):
+    """Hourly engagement counters per project (views, likes, comments), incremented with F()"""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='engagement_buckets')
+    hour = models.DateTimeField(help_text="Start of the hour the engagement happened in")
+    views = models.IntegerField(default=0)
+    likes = models.IntegerField(default=0)
+    comments = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(help_text="Last increment; drives incremental score refreshes")
+
+    class Meta:
+        unique_together = ('project', 'hour')
+        indexes = [models.Index(fields=['updated_at']), models.Index(fields=['hour'])]
+
+    def __str__(self):
+        return f"{self.project_id} @ {self.hour:%Y-%m-%d %H}:00"
+
+
+class ProjectTrendingScore(models.Model):
+    """Forward-decayed engagement score, stored as a log so it never overflows"""
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='trending')
+    log_score = models.FloatField(db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Trending {self.project_id}: {self.log_score:.3f}"
+
+
+class ProjectViewerSketch(models.Model):
+    """All-time HyperLogLog registers of a project's distinct viewers (see myapp/sketches.py)"""
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='viewer_sketch')
+    registers = models.BinaryField()
+
+    def __str__(self):
+        return f"Viewer sketch {self.project_id}"
+
+
+class ProjectDailyViewerSketch(models.Model):
+    """HyperLogLog registers of a project's distinct viewers on one day"""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='daily_viewer_sketches')
+    day = models.DateField()
+    registers = models.BinaryField()
+
+    class Meta:
+        unique_together = ('project', 'day')
+        indexes = [models.Index(fields=['day'])]
+
+    def __str__(self):
+        return f"Viewer sketch {self.project_id} on {self.day}"
+
+
+class RecommendationDirty(models.Model):
+    """Users/projects whose AIRecommendation rows need recomputing (one row per object)"""
+    KIND_CHOICES = [
+        ('user', 'User'),
+        ('project', 'Project'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    enqueued_at = models.DateTimeField(help_text="First time the object was marked dirty")
+    touched_at = models.DateTimeField(help_text="Last time the object was marked dirty")
+
+    class Meta:
+        unique_together = ('kind', 'object_id')
+        indexes = [models.Index(fields=['enqueued_at'])]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
+
+
+class AnnIndexDirty(models.Model):
+    """Users/projects whose ANN index entries need re-embedding or removal (one row per object)"""
+    KIND_CHOICES = [
+        ('user', 'User'),
+        ('project', 'Project'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    touched_at = models.DateTimeField(help_text="Last time the object was marked dirty")
+
+    class Meta:
+        unique_together = ('kind', 'object_id')
+        indexes = [models.Index(fields=['touched_at'])]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
+
+
+class UserSkill(models.Model):
+    """Inverted skill index: one row per normalized skill a user lists"""
+    skill = models.CharField(max_length=100, db_index=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='skill_index')
+
+    class Meta:
+        unique_together = ('skill', 'user')
+
+    def __str__(self):
+        return f"{self.skill} -> {self.user.username}"
+
+
+class EmbeddingCache(models.Model):
+    """Persistent embedding store keyed by model name + hash of the embedded text"""
+    SOURCE_CHOICES = [
+        ('user', 'User profile'),
+        ('project', 'Project'),
+    ]
+
+    model_name = models.CharField(max_length=100)
+    content_hash = models.CharField(max_length=64)
+    vector = models.BinaryField(help_text="float32 vector bytes")
+    source_type = models.CharField(max_length=20, choices=SOURCE_CHOICES, blank=True)
+    source_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('model_name', 'content_hash')
+        indexes = [models.Index(fields=['source_type', 'source_id'])]
+
+    def __str__(self):
+        return f"{self.model_name}:{self.content_hash[:12]}"
+
+
+class FeedEvent(models.Model):
+    """Append-only log of what the feed showed and what users did with it (see myapp/feed_events.py)"""
+    KIND_CHOICES = [
+        ('impression', 'Impression'),
+        ('click', 'Click'),
+        ('like', 'Like'),
+    ]
+
+    # No FK constraints: events outlive their user/project and inserts skip the checks
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    project_id = models.BigIntegerField()
+    kind = models.CharField(max_length=12, choices=KIND_CHOICES)
+    surface = models.CharField(max_length=20, blank=True, help_text="Feed the project was shown in or opened from")
+    position = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Position on the page (impressions)")
+    score = models.FloatField(null=True, blank=True, help_text="Ranker score when shown (impressions)")
+    created_at = models.DateTimeField(help_text="When the event happened, not when it was flushed")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'created_at']),
+            models.Index(fields=['project_id', 'kind']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.project_id} by {self.user_id} ({self.surface or '-'})"
+
+
 # ==================== PROJECT TEMPLATES ====================
 class ProjectTemplate(models.Model):
     """Templates for starting projects"""
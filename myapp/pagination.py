@@ -0,0 +1,91 @@
+# myapp/pagination.py
+
+"""
+Cursor (keyset) pagination for TRENDMIA feeds
+- Chronological feeds: the cursor holds the last row's (created_at, id) and the
+  next page is a WHERE on that key - no COUNT(*), no OFFSET scan
+- Ranked feeds: the cursor holds the ranking snapshot id and a position in it
+- Cursors are opaque, signed strings; a bad or foreign cursor restarts at page 1
+"""
+
+from django.core import signing
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+CURSOR_SALT = 'myapp.pagination.cursor'
+FEED_PAGE_SIZE = 20
+
+
+def encode_cursor(payload):
+    return signing.dumps(payload, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token, kind):
+    """Cursor payload of the given kind, or None for a missing/invalid cursor."""
+    if not token:
+        return None
+    try:
+        payload = signing.loads(token, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        return None
+    if not isinstance(payload, dict) or payload.get('k') != kind:
+        return None
+    return payload
+
+
+class CursorPage:
+    """One page of results plus the cursor for the next one (None on the last page)."""
+
+    def __init__(self, object_list, next_cursor=None):
+        self.object_list = list(object_list)
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def paginate_chronological(queryset, cursor=None, per_page=FEED_PAGE_SIZE):
+    """Newest-first keyset page of queryset, keyed on (created_at, id)."""
+    queryset = queryset.order_by('-created_at', '-id')
+    position = decode_cursor(cursor, 'time')
+    if position:
+        created_at = parse_datetime(position['t'])
+        if created_at is not None:
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=position['id'])
+            )
+    rows = list(queryset[:per_page + 1])
+    next_cursor = None
+    if len(rows) > per_page:
+        last = rows[per_page - 1]
+        next_cursor = encode_cursor({'k': 'time', 't': last.created_at.isoformat(), 'id': last.id})
+    return CursorPage(rows[:per_page], next_cursor)
+
+
+def decode_ranked_cursor(cursor):
+    """(snapshot id, position) from a ranked-feed cursor; (None, 0) to start over."""
+    position = decode_cursor(cursor, 'rank')
+    if not position:
+        return None, 0
+    return position.get('s'), max(int(position.get('p', 0)), 0)
+
+
+def paginate_ranked(entries, snapshot_id, position=0, per_page=FEED_PAGE_SIZE):
+    """
+    Slice of a ranked snapshot starting at position. Returns (page entries,
+    next cursor or None).
+    """
+    page = entries[position:position + per_page]
+    next_position = position + per_page
+    next_cursor = None
+    if next_position < len(entries):
+        next_cursor = encode_cursor({'k': 'rank', 's': snapshot_id, 'p': next_position})
+    return page, next_cursor
@@ -0,0 +1,114 @@
+# myapp/project_features.py
+
+"""
+Project feature store for feed ranking
+- One ProjectFeatures row per project holds what the reranker needs (token
+  set, tag set, skill set, popularity), so ranking never re-tokenizes text or
+  fetches tags per candidate
+- Rows are refreshed on project saves and tag changes; counter-only saves and
+  like toggles refresh just the popularity
+- get_project_features() fills rows lazily for projects that don't have one yet
+"""
+
+from .models import Project, ProjectFeatures
+
+
+def feed_popularity(likes_count, views_count):
+    """Popularity signal used by the hybrid feed, in [0, 1]."""
+    return min(((likes_count or 0) * 2 + (views_count or 0)) / 200.0, 1.0)
+
+
+def _project_tag_names(project_ids):
+    """Lower-cased tag names per project id, in one query."""
+    tags = {project_id: set() for project_id in project_ids}
+    for project_id, name in Project.tags.through.objects.filter(project_id__in=project_ids).values_list(
+        'project_id', 'tag__name'
+    ):
+        if name:
+            tags[project_id].add(name.lower())
+    return tags
+
+
+def build_project_features(project, tag_names):
+    """Unsaved ProjectFeatures for a project and its (lower-cased) tag names."""
+    from .ai_utils import _tokenize_text
+
+    skills_required = project.skills_required if isinstance(project.skills_required, list) else []
+    skills = {s.lower() for s in skills_required if isinstance(s, str)}
+    text = " ".join([
+        project.title or "",
+        project.description or "",
+        project.problem_statement or "",
+        " ".join(s for s in skills_required if isinstance(s, str)),
+    ])
+    return ProjectFeatures(
+        project_id=project.id,
+        tokens=sorted(_tokenize_text(text)),
+        tags=sorted(tag_names),
+        skills=sorted(skills),
+        popularity=feed_popularity(project.likes_count, project.views_count),
+    )
+
+
+def refresh_project_features(projects):
+    """Recompute and upsert features for the given projects. Returns {project_id: ProjectFeatures}."""
+    projects = [project for project in projects if project.pk]
+    if not projects:
+        return {}
+    tag_names = _project_tag_names([project.id for project in projects])
+    rows = [build_project_features(project, tag_names[project.id]) for project in projects]
+    ProjectFeatures.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['project'],
+        update_fields=['tokens', 'tags', 'skills', 'popularity', 'updated_at'],
+    )
+    return {row.project_id: row for row in rows}
+
+
+def refresh_popularity(project):
+    """Cheap refresh for counter-only saves."""
+    ProjectFeatures.objects.filter(project_id=project.pk).update(
+        popularity=feed_popularity(project.likes_count, project.views_count)
+    )
+
+
+def refresh_popularity_for(project_ids):
+    """Popularity refresh for projects whose counters were bumped with queryset updates (no signals)."""
+    counters = {
+        project_id: (likes_count, views_count)
+        for project_id, likes_count, views_count in Project.objects.filter(id__in=project_ids).values_list(
+            'id', 'likes_count', 'views_count'
+        )
+    }
+    features = list(ProjectFeatures.objects.filter(project_id__in=counters))
+    for row in features:
+        row.popularity = feed_popularity(*counters[row.project_id])
+    ProjectFeatures.objects.bulk_update(features, ['popularity'], batch_size=500)
+
+
+def get_project_features(projects):
+    """
+    Features for the given Project instances, {project_id: ProjectFeatures}.
+    One query for stored rows; projects without a row are built and stored.
+    """
+    projects = list(projects)
+    features = ProjectFeatures.objects.in_bulk([project.id for project in projects])
+    missing = [project for project in projects if project.id not in features]
+    if missing:
+        features.update(refresh_project_features(missing))
+    return features
+
+
+def rebuild_project_features(batch_size=500):
+    """Recompute features for every project. Returns rows written."""
+    written = 0
+    batch = []
+    for project in Project.objects.iterator(chunk_size=batch_size):
+        batch.append(project)
+        if len(batch) >= batch_size:
+            written += len(refresh_project_features(batch))
+            batch = []
+    if batch:
+        written += len(refresh_project_features(batch))
+    return written
@@ -0,0 +1,123 @@
+# myapp/recommendation_queue.py
+
+"""
+Dirty queue for incremental AIRecommendation refreshes
+- Model signals mark the users/projects a change affects (RecommendationDirty)
+- Re-marking an already queued object only bumps touched_at, so bursts coalesce
+- The worker drains the queue, expands projects to the users whose rows they
+  can change (at most AI_RECOMMENDATION_PROJECT_FANOUT new candidates per
+  project), and recomputes just those users in RECOMMENDATION_BATCH_SIZE chunks
+- Queue depth and update lag are logged on every run and exposed by queue_stats()
+"""
+
+import logging
+
+from django.conf import settings
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .ai_utils import load_recommendable_projects
+from .models import AIRecommendation, CustomUser, Project, RecommendationDirty
+from .recommender import RECOMMENDATION_BATCH_SIZE, write_recommendations
+from .skill_index import get_candidate_user_ids
+
+
+RECOMMENDATION_QUEUE_BATCH = getattr(settings, 'AI_RECOMMENDATION_QUEUE_BATCH', 500)
+# Best skill-matched users a changed project can newly be recommended to; the
+# rest pick it up on the nightly full refresh
+RECOMMENDATION_PROJECT_FANOUT = getattr(settings, 'AI_RECOMMENDATION_PROJECT_FANOUT', 100)
+
+logger = logging.getLogger(__name__)
+
+
+def _enqueue(kind, object_ids):
+    now = timezone.now()
+    rows = [
+        RecommendationDirty(kind=kind, object_id=object_id, enqueued_at=now, touched_at=now)
+        for object_id in {int(object_id) for object_id in object_ids if object_id}
+    ]
+    if rows:
+        RecommendationDirty.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['kind', 'object_id'],
+            update_fields=['touched_at'],
+        )
+
+
+def enqueue_users(user_ids):
+    _enqueue('user', user_ids)
+
+
+def enqueue_projects(project_ids):
+    _enqueue('project', project_ids)
+
+
+def queue_stats():
+    """Current queue depth and the age (seconds) of the oldest pending change."""
+    stats = RecommendationDirty.objects.aggregate(depth=Count('id'), oldest=Min('enqueued_at'))
+    oldest = stats['oldest']
+    return {
+        'depth': stats['depth'],
+        'oldest_lag_seconds': (timezone.now() - oldest).total_seconds() if oldest else 0.0,
+    }
+
+
+def _affected_user_ids(project_ids):
+    """Users whose recommendations a project change can alter."""
+    user_ids = set(
+        AIRecommendation.objects.filter(project_id__in=project_ids).values_list('user_id', flat=True)
+    )
+    for project in Project.objects.filter(id__in=project_ids).only('id', 'user_id', 'skills_required'):
+        # Owner (exclusions/domains) plus the best users the project could now be recommended to
+        user_ids.add(project.user_id)
+        user_ids.update(get_candidate_user_ids(project, limit=RECOMMENDATION_PROJECT_FANOUT, exploration=0))
+    return user_ids
+
+
+def process_dirty_queue(max_items=RECOMMENDATION_QUEUE_BATCH):
+    """
+    Recompute recommendations for up to max_items queued objects. Entries
+    re-marked while the batch runs stay queued for the next run.
+    Returns {'entries', 'users', 'max_lag_seconds', 'depth'}.
+    """
+    claimed_at = timezone.now()
+    entries = list(
+        RecommendationDirty.objects.order_by('enqueued_at')
+        .values_list('id', 'kind', 'object_id', 'enqueued_at')[:max_items]
+    )
+    if not entries:
+        return {'entries': 0, 'users': 0, 'max_lag_seconds': 0.0, 'depth': 0}
+
+    user_ids = {object_id for _, kind, object_id, _ in entries if kind == 'user'}
+    project_ids = [object_id for _, kind, object_id, _ in entries if kind == 'project']
+    if project_ids:
+        user_ids |= _affected_user_ids(project_ids)
+
+    # One transaction and one IN list per chunk, sharing one candidate load
+    candidates = load_recommendable_projects()
+    user_ids = sorted(user_ids)
+    processed = 0
+    for start in range(0, len(user_ids), RECOMMENDATION_BATCH_SIZE):
+        users = list(
+            CustomUser.objects.filter(id__in=user_ids[start:start + RECOMMENDATION_BATCH_SIZE])
+            .only('id', 'skills', 'location')
+        )
+        write_recommendations(users, candidates)
+        processed += len(users)
+
+    RecommendationDirty.objects.filter(
+        id__in=[entry_id for entry_id, _, _, _ in entries],
+        touched_at__lte=claimed_at,
+    ).delete()
+
+    # Lag: time from the first change to its recommendations being rewritten
+    finished_at = timezone.now()
+    max_lag = max((finished_at - enqueued_at).total_seconds() for _, _, _, enqueued_at in entries)
+    depth = RecommendationDirty.objects.count()
+    logger.info(
+        "recommendation queue: processed %d entries (%d users), max lag %.1fs, depth %d",
+        len(entries), processed, max_lag, depth,
+        extra={'queue_depth': depth, 'update_lag_seconds': max_lag},
+    )
+    return {'entries': len(entries), 'users': processed, 'max_lag_seconds': max_lag, 'depth': depth}
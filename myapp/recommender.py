@@ -0,0 +1,93 @@
+# myapp/recommender.py
+
+"""
+Batch recommender for TRENDMIA
+- Scores recommendable projects for users in chunks, sharing one project
+  feature load across the whole run
+- Writes the top-N per user into AIRecommendation with bulk upserts
+- Rows a run no longer produces are deleted, so the table mirrors the latest scores
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .ai_utils import load_recommendable_projects, score_projects_for_user
+from .models import AIRecommendation, CustomUser, Project, ProjectMember
+
+
+RECOMMENDATIONS_PER_USER = getattr(settings, 'AI_RECOMMENDATIONS_PER_USER', 20)
+RECOMMENDATION_BATCH_SIZE = getattr(settings, 'AI_RECOMMENDATION_BATCH_SIZE', 500)
+
+
+def _load_user_context(user_ids):
+    """Excluded project ids (owned or joined) and owned-project domains per user."""
+    excluded = {user_id: set() for user_id in user_ids}
+    domains = {user_id: set() for user_id in user_ids}
+    for user_id, project_id, domain_id in Project.objects.filter(user_id__in=user_ids).values_list(
+        'user_id', 'id', 'domain_id'
+    ):
+        excluded[user_id].add(project_id)
+        if domain_id:
+            domains[user_id].add(domain_id)
+    for user_id, project_id in ProjectMember.objects.filter(user_id__in=user_ids).values_list(
+        'user_id', 'project_id'
+    ):
+        excluded[user_id].add(project_id)
+    return excluded, domains
+
+
+def write_recommendations(users, candidates=None, limit=RECOMMENDATIONS_PER_USER):
+    """
+    Recompute and store recommendations for the given users. Returns rows written.
+    candidates is a load_recommendable_projects() result to reuse across calls.
+    """
+    users = list(users)
+    if not users:
+        return 0
+    if candidates is None:
+        candidates = load_recommendable_projects()
+    user_ids = [user.id for user in users]
+    excluded, domains = _load_user_context(user_ids)
+
+    # computed_at is stamped on every upsert, so anything older than this run is stale
+    run_started = timezone.now()
+    rows = []
+    for user in users:
+        for rec in score_projects_for_user(user, candidates, excluded[user.id], domains[user.id], limit):
+            rows.append(AIRecommendation(
+                user_id=user.id,
+                project_id=rec['project_id'],
+                score=rec['score'],
+                reason="\n".join(rec['reasons']),
+                computed_at=run_started,
+            ))
+
+    with transaction.atomic():
+        if rows:
+            AIRecommendation.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['user', 'project'],
+                update_fields=['score', 'reason', 'computed_at'],
+                batch_size=1000,
+            )
+        AIRecommendation.objects.filter(user_id__in=user_ids, computed_at__lt=run_started).delete()
+    return len(rows)
+
+
+def refresh_all_recommendations(batch_size=RECOMMENDATION_BATCH_SIZE, limit=RECOMMENDATIONS_PER_USER):
+    """Full rebuild for every user. Returns (users processed, rows written)."""
+    candidates = load_recommendable_projects()
+    processed = written = 0
+    batch = []
+    for user in CustomUser.objects.only('id', 'skills', 'location').order_by('id').iterator(chunk_size=batch_size):
+        batch.append(user)
+        if len(batch) >= batch_size:
+            written += write_recommendations(batch, candidates, limit)
+            processed += len(batch)
+            batch = []
+    if batch:
+        written += write_recommendations(batch, candidates, limit)
+        processed += len(batch)
+    return processed, written
@@ -0,0 +1,88 @@
+# myapp/scoring.py
+
+"""
+Vectorized scoring engine for TRENDMIA recommendations
+- One feature row per candidate, one column per signal
+- Final score = feature matrix @ weight vector
+- Top-K via argpartition instead of sorting every candidate
+"""
+
+import numpy as np
+
+
+# Column order and weights for collaborator matching (project -> users)
+COLLABORATOR_FEATURES = ('skill', 'semantic', 'location', 'domain', 'reliability', 'activity')
+COLLABORATOR_WEIGHTS = np.array([0.35, 0.25, 0.15, 0.15, 0.05, 0.05])
+
+# Column order and weights for project recommendations (user -> projects)
+PROJECT_FEATURES = ('skill', 'domain', 'location', 'popularity')
+PROJECT_WEIGHTS = np.array([0.4, 0.3, 0.2, 0.1])
+
+
+def as_matrix(rows, columns):
+    """Build a float matrix (n_candidates x n_columns) from per-candidate feature rows."""
+    if not rows:
+        return np.zeros((0, len(columns)))
+    return np.asarray(rows, dtype=np.float64).reshape(len(rows), len(columns))
+
+
+def cosine_similarity(vec_a, vec_b):
+    """Cosine similarity of two vectors; 0.0 for empty, mismatched, or zero vectors."""
+    if vec_a is None or vec_b is None:
+        return 0.0
+    a = np.asarray(vec_a, dtype=np.float64)
+    b = np.asarray(vec_b, dtype=np.float64)
+    if a.size == 0 or a.shape != b.shape:
+        return 0.0
+    denom = np.linalg.norm(a) * np.linalg.norm(b)
+    if denom == 0:
+        return 0.0
+    return float(a @ b / denom)
+
+
+def cosine_similarities(query, vectors):
+    """
+    Cosine similarity of query against every vector. Missing or mismatched
+    vectors score 0.0. Returns an array parallel to vectors.
+    """
+    scores = np.zeros(len(vectors))
+    if query is None or not len(vectors):
+        return scores
+    q = np.asarray(query, dtype=np.float64)
+    q_norm = np.linalg.norm(q)
+    if q_norm == 0:
+        return scores
+    present = [i for i, v in enumerate(vectors) if v is not None and len(v) == q.size]
+    if not present:
+        return scores
+    matrix = np.asarray([vectors[i] for i in present], dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sims = np.where(norms > 0, (matrix @ q) / (norms * q_norm), 0.0)
+    scores[present] = sims
+    return scores
+
+
+def weighted_scores(features, weights):
+    """Final scores for every candidate in one matrix-vector product."""
+    return features @ weights
+
+
+def top_k(scores, k, min_score=None):
+    """
+    Indices of the k best scores, best first. Candidates at or below
+    min_score are dropped.
+    """
+    if k <= 0 or not len(scores):
+        return np.zeros(0, dtype=np.int64)
+    indices = np.arange(len(scores))
+    if min_score is not None:
+        indices = indices[scores > min_score]
+        if not len(indices):
+            return indices
+    if len(indices) > k:
+        part = np.argpartition(-scores[indices], k - 1)[:k]
+        indices = indices[part]
+    # Stable tie-break on candidate order, matching a stable sort of the whole list
+    order = np.lexsort((indices, -scores[indices]))
+    return indices[order]
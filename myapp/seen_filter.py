@@ -0,0 +1,78 @@
+# myapp/seen_filter.py
+
+"""
+Per-user seen-project filter
+- A Bloom filter of project ids each user has been shown (feed impressions)
+  or opened (project detail), kept in the cache: SEEN_FILTER_BITS bits
+  (2 KB), ~0.2% false positives at 1,000 projects
+- Decay by generation: marks go into the current SEEN_FILTER_PERIOD_HOURS
+  generation and lookups consult the current and the previous one, so a
+  project is forgotten one to two periods after it was last seen
+- get_hybrid_feed_projects() loads the filter once (one cache round trip, no
+  table joins) to skip seen candidates and demote any it still needs
+- Approximate by design: two concurrent marks for the same user can drop
+  one of them, which only lets a project resurface once more
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+SEEN_FILTER_BITS = 16384
+SEEN_FILTER_HASHES = 4
+SEEN_FILTER_PERIOD = int(getattr(settings, 'SEEN_FILTER_PERIOD_HOURS', 72) * 3600)
+
+
+def _positions(project_id):
+    # Double hashing: k bit positions from two 32-bit halves of one digest
+    digest = hashlib.blake2b(str(project_id).encode(), digest_size=8).digest()
+    first = int.from_bytes(digest[:4], 'big')
+    step = int.from_bytes(digest[4:], 'big') | 1
+    return [(first + i * step) % SEEN_FILTER_BITS for i in range(SEEN_FILTER_HASHES)]
+
+
+def _generation_keys(user_id):
+    """(current, previous) generation cache keys."""
+    generation = int(time.time() // SEEN_FILTER_PERIOD)
+    return f'seen:{user_id}:{generation}', f'seen:{user_id}:{generation - 1}'
+
+
+class SeenFilter:
+    """Membership test over a user's live generations."""
+
+    def __init__(self, generations=()):
+        self.generations = [bytes(bits) for bits in generations]
+
+    def __contains__(self, project_id):
+        positions = _positions(project_id)
+        return any(
+            all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+            for bits in self.generations
+        )
+
+    def __bool__(self):
+        return bool(self.generations)
+
+
+def load_seen_filter(user_id):
+    """The user's seen filter (empty for anonymous users or nothing seen yet)."""
+    if not user_id:
+        return SeenFilter()
+    return SeenFilter(cache.get_many(_generation_keys(user_id)).values())
+
+
+def mark_seen(user_id, project_ids):
+    """Add projects to the user's current generation."""
+    project_ids = list(project_ids)
+    if not user_id or not project_ids:
+        return
+    key = _generation_keys(user_id)[0]
+    bits = bytearray(cache.get(key) or bytes(SEEN_FILTER_BITS // 8))
+    for project_id in project_ids:
+        for position in _positions(project_id):
+            bits[position >> 3] |= 1 << (position & 7)
+    # Outlives the period in which it is the previous generation
+    cache.set(key, bytes(bits), SEEN_FILTER_PERIOD * 2)
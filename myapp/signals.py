@@ -0,0 +1,334 @@
+# myapp/signals.py
+
+"""
+Model signal handlers that keep derived AI/feed data in sync.
+Connected in MyappConfig.ready().
+"""
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .ai_utils import PROJECT_EMBEDDING_FIELDS, USER_EMBEDDING_FIELDS
+from .ann_queue import mark_ann_dirty
+from .catalog import bump_catalog_version
+from .comments import adjust_comments_count
+from .embeddings import invalidate_source
+from .feed_cache import invalidate_user_feeds
+from .models import Comment, CustomUser, Domain, Follow, Like, Project, ProjectMember, Tag
+from .project_features import refresh_popularity, refresh_project_features
+from .recommendation_queue import enqueue_projects, enqueue_users
+from .skill_index import sync_user_skills
+from .tag_similarity import mark_tags_dirty
+from .tag_trends import record_project_tags
+from .trending import record_engagement
+from .timeline import backfill_timeline, fan_out_project, trim_timeline, update_celebrity_status
+
+
+# User fields that change their project recommendations (a subset of USER_EMBEDDING_FIELDS)
+USER_RECOMMENDATION_FIELDS = ('skills', 'location')
+# Stored project fields compared on save: one SELECT covers every feature below
+PROJECT_TRACKED_FIELDS = PROJECT_EMBEDDING_FIELDS + ('visibility',)
+# Counter-only project saves: only the popularity feature is refreshed, nothing is re-queued
+PROJECT_COUNTER_FIELDS = {'views_count', 'likes_count'}
+
+
+def _changed_fields(sender, instance, fields, update_fields):
+    """Names of fields in `fields` whose saved value differs from the instance."""
+    if not instance.pk:
+        return []
+    # Foreign keys are compared by id (domain -> domain_id)
+    attnames = {f: sender._meta.get_field(f).attname for f in fields}
+    if update_fields is not None:
+        fields = [f for f in fields if f in update_fields or attnames[f] in update_fields]
+        if not fields:
+            return []
+    previous = sender.objects.filter(pk=instance.pk).values(*(attnames[f] for f in fields)).first()
+    if previous is None:
+        return []
+    return [f for f in fields if previous[attnames[f]] != getattr(instance, attnames[f])]
+
+
+def _tag_change_project_ids(instance, action, reverse, pk_set):
+    """Project ids whose tags an m2m_changed event on Project.tags changes (once per change)."""
+    if not reverse:
+        return [instance.pk] if action in ('post_add', 'post_remove', 'post_clear') else []
+    # tag.project_set changes: instance is the Tag
+    if action in ('post_add', 'post_remove'):
+        return list(pk_set or ())
+    if action == 'pre_clear':
+        return list(instance.project_set.values_list('id', flat=True))
+    return []
+
+
+@receiver(post_save, sender=CustomUser)
+def update_skill_index(sender, instance, update_fields=None, **kwargs):
+    """Re-index a user's skills whenever their profile is saved."""
+    if update_fields is not None and 'skills' not in update_fields:
+        return
+    sync_user_skills(instance)
+
+
+@receiver(pre_save, sender=CustomUser)
+def invalidate_user_embeddings(sender, instance, update_fields=None, **kwargs):
+    changed = _changed_fields(sender, instance, USER_EMBEDDING_FIELDS, update_fields)
+    instance._embedding_changed = bool(changed)
+    instance._recommendations_changed = any(f in USER_RECOMMENDATION_FIELDS for f in changed)
+    if instance._embedding_changed:
+        invalidate_source('user', instance.pk)
+
+
+@receiver(pre_save, sender=Project)
+def track_project_changes(sender, instance, update_fields=None, **kwargs):
+    """Load the stored row once and flag what this save changes for the post_save handlers."""
+    changed = _changed_fields(sender, instance, PROJECT_TRACKED_FIELDS, update_fields)
+    instance._embedding_changed = any(f in PROJECT_EMBEDDING_FIELDS for f in changed)
+    instance._became_public = instance.visibility == 'public' and 'visibility' in changed
+    if instance._embedding_changed:
+        invalidate_source('project', instance.pk)
+        # Owner profile text includes their project titles/descriptions
+        invalidate_source('user', instance.user_id)
+
+
+@receiver(post_save, sender=CustomUser)
+def index_user(sender, instance, created=False, raw=False, **kwargs):
+    if raw or not (created or getattr(instance, '_embedding_changed', False)):
+        return
+    mark_ann_dirty('user', [instance.pk])
+
+
+@receiver(post_save, sender=Project)
+def index_project(sender, instance, created=False, raw=False, **kwargs):
+    if raw or not (created or getattr(instance, '_embedding_changed', False)):
+        return
+    mark_ann_dirty('project', [instance.pk])
+    # Owner profile text includes their project titles/descriptions
+    mark_ann_dirty('user', [instance.user_id])
+
+
+@receiver(post_delete, sender=CustomUser)
+def unindex_user(sender, instance, **kwargs):
+    mark_ann_dirty('user', [instance.pk])
+
+
+@receiver(post_delete, sender=Project)
+def unindex_project(sender, instance, **kwargs):
+    mark_ann_dirty('project', [instance.pk])
+
+
+# ==================== PROJECT FEATURE STORE ====================
+
+@receiver(post_save, sender=Project)
+def update_project_features(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and set(update_fields) <= PROJECT_COUNTER_FIELDS:
+        refresh_popularity(instance)
+    else:
+        refresh_project_features([instance])
+
+
+@receiver(m2m_changed, sender=Project.tags.through)
+def update_project_tag_features(sender, instance, action, reverse=False, pk_set=None, **kwargs):
+    if reverse and action == 'pre_clear':
+        # Refresh after the clear: remember which projects lose the tag
+        instance._cleared_project_ids = list(instance.project_set.values_list('id', flat=True))
+        return
+    if reverse and action == 'post_clear':
+        project_ids = getattr(instance, '_cleared_project_ids', [])
+    else:
+        project_ids = _tag_change_project_ids(instance, action, reverse, pk_set)
+    if project_ids:
+        refresh_project_features(Project.objects.filter(id__in=project_ids))
+
+
+@receiver(pre_save, sender=Tag)
+def track_tag_rename(sender, instance, update_fields=None, **kwargs):
+    instance._name_changed = bool(_changed_fields(sender, instance, ('name',), update_fields))
+
+
+@receiver(post_save, sender=Tag)
+def update_renamed_tag_features(sender, instance, raw=False, **kwargs):
+    if not raw and getattr(instance, '_name_changed', False):
+        refresh_project_features(instance.project_set.all())
+
+
+# ==================== TAG SIMILARITY ====================
+
+# Changed tags are only queued; the refresh_tag_similarity beat task recomputes them
+
+@receiver(m2m_changed, sender=Project.tags.through)
+def update_tag_cooccurrence(sender, instance, action, reverse=False, pk_set=None, **kwargs):
+    if reverse:
+        # tag.project_set changed: only this tag's co-occurrences move
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            mark_tags_dirty([instance.pk])
+    elif action == 'pre_clear':
+        instance._cleared_tag_ids = list(instance.tags.values_list('id', flat=True))
+    elif action == 'post_clear':
+        mark_tags_dirty(getattr(instance, '_cleared_tag_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        mark_tags_dirty(pk_set or ())
+
+
+@receiver(post_save, sender=Tag)
+def update_tag_similarity(sender, instance, created=False, raw=False, **kwargs):
+    if not raw and (created or getattr(instance, '_name_changed', False)):
+        mark_tags_dirty([instance.pk])
+
+
+# ==================== TAG TREND ROLLUP ====================
+
+@receiver(m2m_changed, sender=Project.tags.through)
+def update_tag_monthly_counts(sender, instance, action, reverse=False, pk_set=None, **kwargs):
+    related = instance.project_set if reverse else instance.tags
+    if action in ('pre_remove', 'pre_clear'):
+        # pre_remove's pk_set may include objects that were never linked
+        linked = related.all() if action == 'pre_clear' else related.filter(pk__in=pk_set or ())
+        instance._removed_tag_link_ids = list(linked.values_list('pk', flat=True))
+        return
+    if action == 'post_add':
+        linked_ids, delta = pk_set or (), 1
+    elif action in ('post_remove', 'post_clear'):
+        linked_ids, delta = getattr(instance, '_removed_tag_link_ids', []), -1
+    else:
+        return
+    if reverse:
+        record_project_tags(linked_ids, [instance.pk], delta)
+    else:
+        record_project_tags([instance.pk], linked_ids, delta)
+
+
+@receiver(pre_delete, sender=Project)
+def remove_deleted_project_tags(sender, instance, **kwargs):
+    # The cascade delete of tag links sends no m2m_changed
+    record_project_tags([instance.pk], list(instance.tags.values_list('id', flat=True)), -1)
+
+
+# ==================== RECOMMENDATION DIRTY QUEUE ====================
+
+@receiver(post_save, sender=CustomUser)
+def mark_user_recommendations_dirty(sender, instance, created=False, raw=False, **kwargs):
+    if raw or not (created or getattr(instance, '_recommendations_changed', False)):
+        return
+    enqueue_users([instance.pk])
+
+
+@receiver(post_save, sender=Project)
+def mark_project_recommendations_dirty(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and set(update_fields) <= PROJECT_COUNTER_FIELDS):
+        return
+    enqueue_projects([instance.pk])
+
+
+@receiver(m2m_changed, sender=Project.tags.through)
+def mark_project_tags_dirty(sender, instance, action, reverse=False, pk_set=None, **kwargs):
+    project_ids = _tag_change_project_ids(instance, action, reverse, pk_set)
+    if project_ids:
+        enqueue_projects(project_ids)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def mark_follower_recommendations_dirty(sender, instance, raw=False, **kwargs):
+    if not raw:
+        enqueue_users([instance.follower_id])
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def mark_member_recommendations_dirty(sender, instance, raw=False, **kwargs):
+    if not raw:
+        enqueue_users([instance.user_id])
+
+
+# ==================== FEED CACHE INVALIDATION ====================
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_follower_feed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_user_feeds([instance.follower_id])
+
+
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+def invalidate_liker_feed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_user_feeds([instance.user_id])
+
+
+@receiver(post_save, sender=Project)
+def invalidate_follower_feeds_on_post(sender, instance, created=False, raw=False, **kwargs):
+    if raw or not created:
+        return
+    # The owner's own projects shape their ranking too
+    follower_ids = list(Follow.objects.filter(following_id=instance.user_id).values_list('follower_id', flat=True))
+    invalidate_user_feeds(follower_ids + [instance.user_id])
+
+
+# ==================== HOME TIMELINE FAN-OUT ====================
+
+# _became_public is set by track_project_changes
+
+@receiver(post_save, sender=Project)
+def fan_out_new_project(sender, instance, created=False, raw=False, **kwargs):
+    if raw or not (created or getattr(instance, '_became_public', False)):
+        return
+    transaction.on_commit(lambda: fan_out_project(instance))
+
+
+@receiver(post_save, sender=Follow)
+def backfill_followed_timeline(sender, instance, created=False, raw=False, **kwargs):
+    if raw or not created:
+        return
+    update_celebrity_status(instance.following_id)
+    backfill_timeline(instance.follower_id, instance.following_id)
+
+
+@receiver(post_delete, sender=Follow)
+def trim_unfollowed_timeline(sender, instance, **kwargs):
+    trim_timeline(instance.follower_id, instance.following_id)
+    # After commit: if the creator themself is being deleted there is nothing left to re-check
+    creator_id = instance.following_id
+    transaction.on_commit(lambda: update_celebrity_status(creator_id))
+
+
+# ==================== COMMENT COUNTS ====================
+
+@receiver(post_save, sender=Comment)
+def increment_comments_count(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        adjust_comments_count(instance.project_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comments_count(sender, instance, **kwargs):
+    adjust_comments_count(instance.project_id, -1)
+
+
+# ==================== TRENDING ENGAGEMENT ====================
+# Removals are taken back out of the hour bucket the like/comment was counted in
+
+@receiver(post_save, sender=Like)
+@receiver(post_save, sender=Comment)
+def count_engagement(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        record_engagement(instance.project_id, 'likes' if sender is Like else 'comments', 1, instance.created_at)
+
+
+@receiver(post_delete, sender=Like)
+@receiver(post_delete, sender=Comment)
+def uncount_engagement(sender, instance, **kwargs):
+    record_engagement(instance.project_id, 'likes' if sender is Like else 'comments', -1, instance.created_at)
+
+
+# ==================== CATALOG CACHE ====================
+
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_catalog(sender, instance, **kwargs):
+    # After commit, so no worker reloads the catalog before the change is visible
+    transaction.on_commit(bump_catalog_version)
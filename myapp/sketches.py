@@ -0,0 +1,189 @@
+# myapp/sketches.py
+
+"""
+HyperLogLog unique-viewer sketches
+- Every project keeps HLL_REGISTERS one-byte registers per day
+  (ProjectDailyViewerSketch) and for all time (ProjectViewerSketch): ~1 KB per
+  row, ~3% standard error, however many people view the project
+- A viewer is hashed to one register and can only raise it, so refreshes by
+  the same viewer never change the estimate
+- project_detail buffers register updates in-process (only the max per
+  register is kept); a background thread merges them into the stored blobs
+  every VIEW_COUNTER_FLUSH_INTERVAL seconds under row locks. Merging is a
+  per-register max, so flushes from different workers combine losslessly
+- Estimates over several days merge the daily sketches (a union), so a
+  viewer seen on three days counts once
+"""
+
+import atexit
+import hashlib
+import logging
+import math
+import threading
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .flushers import BackgroundFlusher
+from .models import Project, ProjectDailyViewerSketch, ProjectViewerSketch
+
+
+# Changing the precision invalidates every stored sketch
+HLL_PRECISION = 10
+HLL_REGISTERS = 1 << HLL_PRECISION
+EMPTY_REGISTERS = bytes(HLL_REGISTERS)
+
+VIEWER_SKETCH_FLUSH_INTERVAL = getattr(settings, 'VIEW_COUNTER_FLUSH_INTERVAL', 10)
+VIEWER_SKETCH_RETENTION_DAYS = getattr(settings, 'VIEWER_SKETCH_RETENTION_DAYS', 90)
+
+logger = logging.getLogger(__name__)
+
+_pending = defaultdict(dict)  # (project_id, day) -> {register index: rank}
+_pending_lock = threading.Lock()
+
+
+def register_for(viewer):
+    """(register index, rank) a viewer key maps to."""
+    value = int.from_bytes(hashlib.blake2b(str(viewer).encode(), digest_size=8).digest(), 'big')
+    remaining_bits = 64 - HLL_PRECISION
+    index = value >> remaining_bits
+    rest = value & ((1 << remaining_bits) - 1)
+    return index, remaining_bits - rest.bit_length() + 1
+
+
+def merge_registers(*sketches):
+    """Register-wise max of several sketches (the sketch of the union)."""
+    merged = bytearray(EMPTY_REGISTERS)
+    for registers in sketches:
+        for index, rank in enumerate(bytes(registers)):
+            if rank > merged[index]:
+                merged[index] = rank
+    return bytes(merged)
+
+
+def estimate_cardinality(registers):
+    """Estimated number of distinct viewers in a sketch."""
+    registers = bytes(registers)
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / sum(2.0 ** -rank for rank in registers)
+    zeros = registers.count(0)
+    # Small-range correction (linear counting); 64-bit hashes need no large-range one
+    if raw <= 2.5 * m and zeros:
+        return round(m * math.log(m / zeros))
+    return round(raw)
+
+
+def record_viewer(project_id, viewer):
+    """Add one viewer (any stable key, e.g. the user id) to today's sketch."""
+    index, rank = register_for(viewer)
+    with _pending_lock:
+        registers = _pending[(project_id, timezone.localdate())]
+        if rank > registers.get(index, 0):
+            registers[index] = rank
+    _flusher.ensure_started()
+
+
+def _raise_registers(rows, key, pending):
+    """Apply pending register updates to locked rows; returns the rows that changed."""
+    changed = []
+    for row in rows:
+        updates = pending.get(key(row))
+        if not updates:
+            continue
+        registers = bytearray(row.registers)
+        raised = False
+        for index, rank in updates.items():
+            if rank > registers[index]:
+                registers[index] = rank
+                raised = True
+        if raised:
+            row.registers = bytes(registers)
+            changed.append(row)
+    return changed
+
+
+def flush_viewer_sketches():
+    """Merge buffered register updates into the stored sketches. Returns rows written."""
+    global _pending
+    with _pending_lock:
+        pending, _pending = _pending, defaultdict(dict)
+    if not pending:
+        return 0
+    existing = set(
+        Project.objects.filter(id__in={project_id for project_id, _ in pending}).values_list('id', flat=True)
+    )
+    daily = {key: updates for key, updates in pending.items() if key[0] in existing}
+    all_time = defaultdict(dict)
+    for (project_id, _), updates in daily.items():
+        registers = all_time[project_id]
+        for index, rank in updates.items():
+            if rank > registers.get(index, 0):
+                registers[index] = rank
+    try:
+        with transaction.atomic():
+            ProjectDailyViewerSketch.objects.bulk_create(
+                [
+                    ProjectDailyViewerSketch(project_id=project_id, day=day, registers=EMPTY_REGISTERS)
+                    for project_id, day in daily
+                ],
+                ignore_conflicts=True,
+            )
+            ProjectViewerSketch.objects.bulk_create(
+                [ProjectViewerSketch(project_id=project_id, registers=EMPTY_REGISTERS) for project_id in all_time],
+                ignore_conflicts=True,
+            )
+            # Locked in pk order so concurrent flushes can't deadlock
+            daily_rows = ProjectDailyViewerSketch.objects.select_for_update().filter(
+                project_id__in=list(all_time), day__in={day for _, day in daily}
+            ).order_by('pk')
+            changed_daily = _raise_registers(daily_rows, lambda row: (row.project_id, row.day), daily)
+            all_time_rows = ProjectViewerSketch.objects.select_for_update().filter(
+                project_id__in=list(all_time)
+            ).order_by('pk')
+            changed_all_time = _raise_registers(all_time_rows, lambda row: row.project_id, all_time)
+            ProjectDailyViewerSketch.objects.bulk_update(changed_daily, ['registers'])
+            ProjectViewerSketch.objects.bulk_update(changed_all_time, ['registers'])
+    except Exception:
+        # Nothing was written; merge the updates back for the next flush
+        logger.exception("viewer sketch flush failed; %d sketches re-queued", len(daily))
+        with _pending_lock:
+            for key, updates in daily.items():
+                registers = _pending[key]
+                for index, rank in updates.items():
+                    if rank > registers.get(index, 0):
+                        registers[index] = rank
+        return 0
+    return len(changed_daily) + len(changed_all_time)
+
+
+_flusher = BackgroundFlusher('viewer-sketch-flusher', flush_viewer_sketches, VIEWER_SKETCH_FLUSH_INTERVAL)
+atexit.register(flush_viewer_sketches)
+
+
+def unique_viewer_estimates(project_id, days=7):
+    """
+    Estimated distinct viewers of a project: {'today', 'recent', 'all_time'},
+    where 'recent' covers the last `days` days including today.
+    """
+    today = timezone.localdate()
+    daily = dict(
+        ProjectDailyViewerSketch.objects.filter(
+            project_id=project_id, day__gt=today - timedelta(days=days)
+        ).values_list('day', 'registers')
+    )
+    all_time = ProjectViewerSketch.objects.filter(project_id=project_id).values_list('registers', flat=True).first()
+    return {
+        'today': estimate_cardinality(daily.get(today, EMPTY_REGISTERS)),
+        'recent': estimate_cardinality(merge_registers(*daily.values())),
+        'all_time': estimate_cardinality(all_time or EMPTY_REGISTERS),
+    }
+
+
+def prune_daily_viewer_sketches():
+    """Drop daily sketches older than the retention window."""
+    cutoff = timezone.localdate() - timedelta(days=VIEWER_SKETCH_RETENTION_DAYS)
+    return ProjectDailyViewerSketch.objects.filter(day__lt=cutoff).delete()[0]
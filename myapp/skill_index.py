@@ -0,0 +1,160 @@
+# myapp/skill_index.py
+
+"""
+Inverted skill index for collaborator candidate generation
+- Maps normalized skill -> user ids (UserSkill rows), so matching only scores
+  users that share a required skill instead of the whole user table
+- Partial (substring) matches are resolved against the cached vocabulary of
+  distinct skills, so the index is always queried with an exact skill IN (...)
+- Kept in sync on profile saves; rebuild_skill_index() backfills everything
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import CustomUser, Project, UserSkill
+
+# Max skill-matched users handed to the scorer per call
+CANDIDATE_LIMIT = 500
+# Users without a skill hit that still get scored (location/domain/activity)
+EXPLORATION_POOL = 25
+
+SKILL_MAX_LENGTH = UserSkill._meta.get_field('skill').max_length
+
+SKILL_VOCABULARY_KEY = 'skill_index:vocabulary'
+# Backstop only: new skills invalidate the cached vocabulary as they are indexed
+SKILL_VOCABULARY_TTL = 3600
+
+
+def normalize_skill(skill):
+    """Normalize a skill name the same way matching compares them."""
+    if not isinstance(skill, str):
+        return ""
+    return skill.strip().lower()[:SKILL_MAX_LENGTH]
+
+
+def normalized_skill_set(skills):
+    """Normalized, de-duplicated set of non-empty skill names."""
+    return {s for s in (normalize_skill(skill) for skill in skills or []) if s}
+
+
+def sync_user_skills(user, skills=None):
+    """Bring a user's UserSkill rows in line with their skills field."""
+    if skills is None:
+        from .ai_utils import get_user_skills_list
+        skills = get_user_skills_list(user)
+    wanted = normalized_skill_set(skills)
+    existing = set(UserSkill.objects.filter(user=user).values_list('skill', flat=True))
+    if wanted == existing:
+        return
+    added = wanted - existing
+    with transaction.atomic():
+        stale = existing - wanted
+        if stale:
+            UserSkill.objects.filter(user=user, skill__in=stale).delete()
+        UserSkill.objects.bulk_create(
+            [UserSkill(user=user, skill=skill) for skill in added],
+            ignore_conflicts=True,
+        )
+        # Skills that left the index can stay in the vocabulary: they just match no rows
+        vocabulary = cache.get(SKILL_VOCABULARY_KEY)
+        if vocabulary is not None and not added <= vocabulary:
+            transaction.on_commit(lambda: cache.delete(SKILL_VOCABULARY_KEY))
+
+
+def rebuild_skill_index(batch_size=1000):
+    """Rebuild the whole index from CustomUser.skills. Returns rows written."""
+    from .ai_utils import get_user_skills_list
+
+    written = 0
+    with transaction.atomic():
+        UserSkill.objects.all().delete()
+        batch = []
+        for user in CustomUser.objects.only('id', 'skills').iterator(chunk_size=batch_size):
+            for skill in normalized_skill_set(get_user_skills_list(user)):
+                batch.append(UserSkill(user_id=user.id, skill=skill))
+            if len(batch) >= batch_size:
+                UserSkill.objects.bulk_create(batch, ignore_conflicts=True)
+                written += len(batch)
+                batch = []
+        if batch:
+            UserSkill.objects.bulk_create(batch, ignore_conflicts=True)
+            written += len(batch)
+    cache.delete(SKILL_VOCABULARY_KEY)
+    return written
+
+
+def get_skill_vocabulary():
+    """Distinct indexed skill names (cached)."""
+    vocabulary = cache.get(SKILL_VOCABULARY_KEY)
+    if vocabulary is None:
+        vocabulary = frozenset(UserSkill.objects.order_by().values_list('skill', flat=True).distinct())
+        cache.set(SKILL_VOCABULARY_KEY, vocabulary, SKILL_VOCABULARY_TTL)
+    return vocabulary
+
+
+def matching_skills(required_skills):
+    """
+    Indexed skills matching any required skill: exact hits plus the same
+    two-way substring rule calculate_skill_similarity uses.
+    """
+    return {
+        skill for skill in get_skill_vocabulary()
+        if any(req_skill in skill or skill in req_skill for req_skill in required_skills)
+    }
+
+
+def get_candidate_user_ids(project, limit=CANDIDATE_LIMIT, exploration=EXPLORATION_POOL):
+    """
+    Candidate user ids for a project: users sharing (or partially sharing) a
+    required skill, best overlap first, plus a small exploration pool of users
+    who can still match on location, domain, or activity.
+    """
+    required_skills = sorted(normalized_skill_set(
+        project.skills_required if isinstance(project.skills_required, list) else []
+    ))
+    if not required_skills:
+        return []
+
+    matches = UserSkill.objects.exclude(user_id=project.user_id).filter(
+        skill__in=matching_skills(required_skills)
+    )
+
+    candidate_ids = list(
+        matches.values('user_id')
+        .annotate(hits=Count('id'))
+        .order_by('-hits', 'user_id')
+        .values_list('user_id', flat=True)[:limit]
+    )
+    if not exploration:
+        return candidate_ids
+
+    seen = set(candidate_ids)
+    seen.add(project.user_id)
+    explore_filter = Q()
+    if project.location:
+        explore_filter |= Q(location__icontains=project.location.strip())
+    if project.domain_id:
+        explore_filter |= Q(id__in=Project.objects.filter(domain_id=project.domain_id).values('user_id'))
+
+    pools = []
+    if explore_filter:
+        pools.append(CustomUser.objects.filter(explore_filter))
+    pools.append(CustomUser.objects.all())
+
+    explored = []
+    for pool in pools:
+        remaining = exploration - len(explored)
+        if remaining <= 0:
+            break
+        ids = (
+            pool.exclude(id__in=seen)
+            .order_by('-contribution_streak', '-id')
+            .values_list('id', flat=True)[:remaining]
+        )
+        for user_id in ids:
+            seen.add(user_id)
+            explored.append(user_id)
+
+    return candidate_ids + explored
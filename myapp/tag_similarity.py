@@ -0,0 +1,144 @@
+# myapp/tag_similarity.py
+
+"""
+Tag-to-tag similarity matrix for tag-based feed recommendations
+- Lexical part (same rules the feed used inline): 1 when one lower-cased name
+  contains the other, 0.5 when a word of the source tag appears in the target
+- Co-occurrence part: Jaccard overlap of the projects carrying both tags,
+  weighted by TAG_COOCCURRENCE_WEIGHT
+- Only non-zero pairs are stored; tags that are renamed or added to/removed
+  from projects are marked dirty (TagSimilarityDirty) and their rows are
+  recomputed off the request path by the refresh_tag_similarity beat task
+- Every tag has a self row, so a tag without one simply hasn't been built yet
+"""
+
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Project, Tag, TagSimilarity, TagSimilarityDirty
+
+
+TAG_COOCCURRENCE_WEIGHT = getattr(settings, 'TAG_COOCCURRENCE_WEIGHT', 0.5)
+# Dirty tags recomputed per task run
+TAG_SIMILARITY_QUEUE_BATCH = 200
+
+
+def lexical_similarity(source, target):
+    """Name match score between two lower-cased tag names."""
+    if source in target or target in source:
+        return 1.0
+    if any(word in target for word in source.split()):
+        return 0.5
+    return 0.0
+
+
+def _cooccurrence(tag_ids):
+    """Jaccard overlap {(a, b): score} for every co-occurring pair involving tag_ids (both orders)."""
+    through = Project.tags.through.objects
+    projects = defaultdict(set)
+    for project_id, tag_id in through.filter(
+        project_id__in=through.filter(tag_id__in=tag_ids).values('project_id')
+    ).values_list('project_id', 'tag_id'):
+        projects[project_id].add(tag_id)
+
+    pairs = Counter()
+    for tags in projects.values():
+        for a in tags & tag_ids:
+            for b in tags:
+                if a != b:
+                    pairs[(a, b)] += 1
+                    pairs[(b, a)] += 1
+    related = {tag_id for pair in pairs for tag_id in pair}
+    totals = dict(
+        through.filter(tag_id__in=related).values('tag_id').annotate(n=Count('id')).values_list('tag_id', 'n')
+    )
+    scores = {}
+    for (a, b), both in pairs.items():
+        # Each unordered pair was counted once from every side that is in tag_ids
+        both //= 2 if a in tag_ids and b in tag_ids else 1
+        scores[(a, b)] = both / (totals[a] + totals[b] - both)
+    return scores
+
+
+def refresh_tag_similarity(tag_ids=None):
+    """
+    Recompute every row whose source or target is in tag_ids (all tags when
+    None). Returns rows written.
+    """
+    names = {tag_id: name.lower() for tag_id, name in Tag.objects.values_list('id', 'name')}
+    tag_ids = set(names) if tag_ids is None else {tag_id for tag_id in tag_ids if tag_id in names}
+    if not tag_ids:
+        return 0
+
+    scores = {}
+    for a in tag_ids:
+        for b, name in names.items():
+            for source, target in ((a, b), (b, a)):
+                score = lexical_similarity(names[source], names[target])
+                if score:
+                    scores[(source, target)] = score
+    for pair, overlap in _cooccurrence(tag_ids).items():
+        scores[pair] = scores.get(pair, 0.0) + TAG_COOCCURRENCE_WEIGHT * overlap
+
+    rows = [
+        TagSimilarity(source_id=source, target_id=target, score=score)
+        for (source, target), score in scores.items()
+        if score > 0
+    ]
+    with transaction.atomic():
+        TagSimilarity.objects.filter(Q(source_id__in=tag_ids) | Q(target_id__in=tag_ids)).delete()
+        TagSimilarity.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def get_tag_similarities(source_ids, target_ids):
+    """
+    {(source_id, target_id): score} for the given tags, in one query. Source
+    tags that have never been built are computed (and re-read) first.
+    """
+    source_ids = set(source_ids)
+    target_ids = set(target_ids)
+    if not source_ids or not target_ids:
+        return {}
+    rows = TagSimilarity.objects.filter(
+        source_id__in=source_ids, target_id__in=target_ids | source_ids
+    ).values_list('source_id', 'target_id', 'score')
+    similarities = {(source, target): score for source, target, score in rows}
+    missing = {tag_id for tag_id in source_ids if (tag_id, tag_id) not in similarities}
+    if missing:
+        refresh_tag_similarity(missing)
+        similarities = {(source, target): score for source, target, score in rows.all()}
+    return {pair: score for pair, score in similarities.items() if pair[1] in target_ids}
+
+
+def mark_tags_dirty(tag_ids):
+    """Queue tags for recomputation; re-marking a queued tag only bumps touched_at."""
+    now = timezone.now()
+    rows = [TagSimilarityDirty(tag_id=tag_id, touched_at=now) for tag_id in {int(tag_id) for tag_id in tag_ids}]
+    if rows:
+        TagSimilarityDirty.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['tag'],
+            update_fields=['touched_at'],
+        )
+
+
+def refresh_dirty_tag_similarity(max_items=TAG_SIMILARITY_QUEUE_BATCH):
+    """
+    Recompute rows for up to max_items dirty tags. Tags re-marked while the
+    batch runs stay queued. Returns {'tags', 'rows'}.
+    """
+    claimed_at = timezone.now()
+    tag_ids = list(
+        TagSimilarityDirty.objects.order_by('touched_at').values_list('tag_id', flat=True)[:max_items]
+    )
+    if not tag_ids:
+        return {'tags': 0, 'rows': 0}
+    written = refresh_tag_similarity(tag_ids)
+    TagSimilarityDirty.objects.filter(tag_id__in=tag_ids, touched_at__lte=claimed_at).delete()
+    return {'tags': len(tag_ids), 'rows': written}
@@ -0,0 +1,169 @@
+# myapp/tag_trends.py
+
+"""
+Monthly tag rollups for the trending page
+- TagMonthlyCount holds, per tag and calendar month, how many projects created
+  in that month carry the tag
+- Tag add/remove/clear and project deletion adjust the rollup with F()
+  increments; rebuild_tag_monthly_counts() recomputes it from Project/Tag
+- Trending score: each month with activity is weighted 1/(months from the
+  latest one + 1), newest = 1, and a tag scores the weighted sum of its counts
+- Tag history charts are rendered once per distinct series into a
+  content-addressed PNG under MEDIA_ROOT (matplotlib is imported only then)
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, DateField, F, FloatField, Sum, Value, When
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Project, TagMonthlyCount
+
+
+# Rendered tag history charts, relative to MEDIA_ROOT
+TAG_HISTORY_IMAGE_DIR = 'tag_history'
+
+
+def month_start(value):
+    """First day of value's month, in the current time zone (as TruncMonth computes it)."""
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date().replace(day=1)
+
+
+def apply_tag_deltas(deltas):
+    """Add {(tag_id, month): delta} to the rollup; one UPDATE per distinct (month, delta)."""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    TagMonthlyCount.objects.bulk_create(
+        [TagMonthlyCount(tag_id=tag_id, month=month, count=0) for tag_id, month in deltas],
+        ignore_conflicts=True,
+    )
+    groups = defaultdict(list)
+    for (tag_id, month), delta in deltas.items():
+        groups[(month, delta)].append(tag_id)
+    for (month, delta), tag_ids in groups.items():
+        TagMonthlyCount.objects.filter(month=month, tag_id__in=tag_ids).update(count=F('count') + delta)
+
+
+def record_project_tags(project_ids, tag_ids, delta):
+    """Every given project gained (delta=1) or lost (delta=-1) every given tag."""
+    deltas = defaultdict(int)
+    for created_at in Project.objects.filter(id__in=project_ids).values_list('created_at', flat=True):
+        month = month_start(created_at)
+        for tag_id in tag_ids:
+            deltas[(tag_id, month)] += delta
+    apply_tag_deltas(deltas)
+
+
+def rebuild_tag_monthly_counts():
+    """Recompute the whole rollup from the project/tag tables. Returns rows written."""
+    counts = (
+        Project.tags.through.objects
+        .annotate(month=TruncMonth('project__created_at', output_field=DateField()))
+        .values('tag_id', 'month')
+        .annotate(n=Count('id'))
+        .values_list('tag_id', 'month', 'n')
+    )
+    rows = [TagMonthlyCount(tag_id=tag_id, month=month, count=n) for tag_id, month, n in counts]
+    with transaction.atomic():
+        TagMonthlyCount.objects.all().delete()
+        TagMonthlyCount.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def month_weights():
+    """{month: weight} over months with any tagged project; newest weighs 1, the one before 1/2, ..."""
+    months = sorted(
+        TagMonthlyCount.objects.filter(count__gt=0).values_list('month', flat=True).distinct(),
+        reverse=True,
+    )
+    return {month: 1 / (i + 1) for i, month in enumerate(months)}
+
+
+def trending_tag_scores(limit=None):
+    """[(tag name, weighted score)], highest first, from one aggregate query over the rollup."""
+    weights = month_weights()
+    if not weights:
+        return []
+    weight = Case(
+        *[When(month=month, then=Value(w)) for month, w in weights.items()],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    scores = (
+        TagMonthlyCount.objects.filter(count__gt=0)
+        .values('tag__name')
+        .annotate(score=Sum(F('count') * weight, output_field=FloatField()))
+        .order_by('-score', 'tag__name')
+        .values_list('tag__name', 'score')
+    )
+    return list(scores[:limit] if limit else scores)
+
+
+def tag_history(tag_name):
+    """Monthly series [('YYYY-MM', count)], oldest first, for months the tag was used."""
+    months = (
+        TagMonthlyCount.objects.filter(tag__name=tag_name, count__gt=0)
+        .order_by('month')
+        .values_list('month', 'count')
+    )
+    return [(f'{month:%Y-%m}', count) for month, count in months]
+
+
+def series_digest(tag_name, series):
+    """Stable content hash of a tag's series (ETag and image file name)."""
+    payload = json.dumps([tag_name, series], separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def tag_history_image_url(tag_name, series):
+    """
+    MEDIA URL of the PNG chart for this exact series, rendering it only if
+    that file doesn't exist yet. Older renders of the tag are removed.
+    """
+    slug = re.sub(r'[^a-z0-9]+', '-', tag_name.lower()).strip('-')[:40]
+    # The name hash keeps tags whose slugs collide (e.g. "C" / "C++") apart
+    prefix = f"{slug}-{hashlib.sha1(tag_name.encode('utf-8')).hexdigest()[:8]}-"
+    filename = f'{prefix}{series_digest(tag_name, series)[:16]}.png'
+    directory = os.path.join(settings.MEDIA_ROOT, TAG_HISTORY_IMAGE_DIR)
+    path = os.path.join(directory, filename)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        _render_tag_history(tag_name, series, directory, path)
+        for name in os.listdir(directory):
+            if name.startswith(prefix) and name != filename:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+    return f'{settings.MEDIA_URL}{TAG_HISTORY_IMAGE_DIR}/{filename}'
+
+
+def _render_tag_history(tag_name, series, directory, path):
+    # matplotlib is heavy; only chart renders pay for importing it
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(6, 4))
+    axes = figure.subplots()
+    axes.plot([month for month, _ in series], [count for _, count in series], color='r', linewidth=2)
+    axes.set_xlabel('MonthYear')
+    axes.set_ylabel('Occurrences')
+    axes.set_title(f'History of Tag "{tag_name}" Over Past Months')
+    axes.tick_params(axis='x', labelrotation=45)
+    axes.grid(True, linestyle='--', alpha=0.5)
+    figure.tight_layout()
+    # Write to a temp file and rename, so concurrent renders never serve a partial image
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as handle:
+        figure.savefig(handle, format='png')
+    os.replace(tmp_path, path)
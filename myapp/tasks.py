@@ -0,0 +1,71 @@
+# myapp/tasks.py
+
+"""
+Celery tasks for TRENDMIA (scheduled in settings.CELERY_BEAT_SCHEDULE)
+"""
+
+from celery import shared_task
+
+from .ann_queue import process_ann_queue, rebuild_ann_indexes
+from .counters import flush_view_counts as flush_project_view_counts
+from .likes import reconcile_like_counts as reconcile_project_like_counts
+from .recommendation_queue import process_dirty_queue
+from .recommender import refresh_all_recommendations
+from .sketches import prune_daily_viewer_sketches
+from .tag_similarity import refresh_dirty_tag_similarity
+from .trending import refresh_changed_trending_scores
+
+
+@shared_task
+def refresh_ai_recommendations():
+    """Nightly full rebuild of the AIRecommendation table."""
+    processed, written = refresh_all_recommendations()
+    return {'users': processed, 'recommendations': written}
+
+
+@shared_task
+def process_recommendation_queue():
+    """Recompute recommendations for users/projects marked dirty since the last run."""
+    return process_dirty_queue()
+
+
+@shared_task
+def refresh_trending_scores():
+    """Recompute decayed trending scores for projects with new engagement."""
+    return refresh_changed_trending_scores()
+
+
+@shared_task
+def flush_view_counts():
+    """Apply buffered project views (Redis counter store) to the database."""
+    return {'projects': flush_project_view_counts()}
+
+
+@shared_task
+def reconcile_like_counts():
+    """Repair likes_count drift against the Like rows."""
+    return {'repaired': reconcile_project_like_counts()}
+
+
+@shared_task
+def prune_viewer_sketches():
+    """Drop daily unique-viewer sketches past the retention window."""
+    return {'pruned': prune_daily_viewer_sketches()}
+
+
+@shared_task
+def refresh_tag_similarity():
+    """Recompute TagSimilarity rows for tags changed since the last run."""
+    return refresh_dirty_tag_similarity()
+
+
+@shared_task
+def process_ann_index_queue():
+    """Re-embed and upsert (or remove) users/projects changed since the last run."""
+    return process_ann_queue()
+
+
+@shared_task
+def rebuild_ann_index():
+    """Nightly full re-embed; fresh snapshots also compact the delta logs."""
+    return {name: len(index) for name, index in rebuild_ann_indexes().items()}
@@ -1,5 +1,169 @@
 # test.py
 
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from .ann_index import IVFIndex
+from .models import CustomUser, Project
+from .pagination import decode_ranked_cursor, encode_cursor, paginate_chronological, paginate_ranked
+from .seen_filter import SEEN_FILTER_PERIOD, load_seen_filter, mark_seen
+from .sketches import EMPTY_REGISTERS, HLL_REGISTERS, estimate_cardinality, merge_registers, register_for
+
+
+def _sketch(viewers):
+    """Registers of a sketch holding the given viewers (as record_viewer + flush would)."""
+    registers = bytearray(EMPTY_REGISTERS)
+    for viewer in viewers:
+        index, rank = register_for(viewer)
+        registers[index] = max(registers[index], rank)
+    return bytes(registers)
+
+
+# ==================== ANN (IVF) INDEX ====================
+
+class IVFIndexTests(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.ids = list(range(1, 401))
+        self.vectors = rng.normal(size=(400, 16)).astype(np.float32)
+        self.index = IVFIndex.build(self.ids, self.vectors, 'test-model', nlist=8)
+        self.queries = rng.normal(size=(20, 16)).astype(np.float32)
+
+    def exact_nearest(self, query, exclude=()):
+        normalized = self.vectors / np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        scores = normalized @ (query / np.linalg.norm(query))
+        return max((i for i in self.ids if i not in exclude), key=lambda i: scores[i - 1])
+
+    def test_full_probe_returns_exact_nearest(self):
+        for query in self.queries:
+            results = self.index.search(query, 5, nprobe=8)
+            self.assertEqual(results[0][0], self.exact_nearest(query))
+            self.assertEqual([score for _, score in results], sorted((score for _, score in results), reverse=True))
+
+    def test_indexed_vector_finds_itself_with_one_probe(self):
+        for item_id in (1, 150, 400):
+            self.assertEqual(self.index.search(self.vectors[item_id - 1], 1, nprobe=1)[0][0], item_id)
+
+    def test_remove_and_exclude(self):
+        query = self.queries[0]
+        nearest = self.exact_nearest(query)
+        self.assertNotIn(nearest, [i for i, _ in self.index.search(query, 5, nprobe=8, exclude={nearest})])
+        self.index.remove(nearest)
+        self.assertNotIn(nearest, self.index)
+        self.assertEqual(self.index.search(query, 1, nprobe=8)[0][0], self.exact_nearest(query, exclude={nearest}))
+
+
+# ==================== HYPERLOGLOG SKETCHES ====================
+
+class ViewerSketchTests(SimpleTestCase):
+    # Three standard errors (1.04 / sqrt(m), ~3.3% each); hashing is deterministic
+    TOLERANCE = 3 * 1.04 / HLL_REGISTERS ** 0.5
+
+    def assertEstimates(self, registers, expected):
+        estimate = estimate_cardinality(registers)
+        self.assertLessEqual(abs(estimate - expected), expected * self.TOLERANCE, estimate)
+
+    def test_empty_sketch(self):
+        self.assertEqual(estimate_cardinality(EMPTY_REGISTERS), 0)
+
+    def test_estimate_within_error(self):
+        for count in (100, 1000, 50000):
+            self.assertEstimates(_sketch(range(count)), count)
+
+    def test_repeat_viewers_do_not_count(self):
+        self.assertEqual(_sketch(list(range(500)) * 3), _sketch(range(500)))
+
+    def test_merge_is_union(self):
+        first, second = _sketch(range(0, 3000)), _sketch(range(2000, 5000))
+        merged = merge_registers(first, second)
+        self.assertEqual(merged, _sketch(range(5000)))
+        self.assertEqual(merge_registers(first, EMPTY_REGISTERS), first)
+        self.assertEstimates(merged, 5000)
+
+
+# ==================== SEEN-PROJECT BLOOM FILTER ====================
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SeenFilterTests(SimpleTestCase):
+    START = SEEN_FILTER_PERIOD * 1000  # start of a generation
+
+    def setUp(self):
+        cache.clear()
+
+    def at(self, seconds):
+        return mock.patch('myapp.seen_filter.time.time', return_value=self.START + seconds)
+
+    def test_no_false_negatives(self):
+        with self.at(0):
+            mark_seen(7, range(1, 1001))
+            seen = load_seen_filter(7)
+        self.assertTrue(all(project_id in seen for project_id in range(1, 1001)))
+        false_positives = sum(project_id in seen for project_id in range(100001, 110001))
+        self.assertLess(false_positives, 100)
+
+    def test_filters_are_per_user(self):
+        with self.at(0):
+            mark_seen(7, [42])
+            self.assertNotIn(42, load_seen_filter(8))
+            self.assertFalse(load_seen_filter(None))
+
+    def test_mark_forgotten_after_two_generations(self):
+        with self.at(0):
+            mark_seen(7, [42])
+        with self.at(SEEN_FILTER_PERIOD):
+            self.assertIn(42, load_seen_filter(7))
+        with self.at(2 * SEEN_FILTER_PERIOD):
+            self.assertNotIn(42, load_seen_filter(7))
+
+
+# ==================== CURSOR PAGINATION ====================
+
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = CustomUser.objects.create(username='owner')
+        projects = [Project.objects.create(user=owner, title=f'Project {i}') for i in range(25)]
+        # Five projects per timestamp, so pages break in the middle of ties
+        start = timezone.now()
+        for i, project in enumerate(projects):
+            Project.objects.filter(pk=project.pk).update(created_at=start - timedelta(hours=i // 5))
+        cls.expected = list(Project.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+    def walk(self, per_page):
+        ids, cursor = [], None
+        while True:
+            page = paginate_chronological(Project.objects.all(), cursor, per_page)
+            ids += [project.id for project in page]
+            if not page.has_next:
+                return ids
+            cursor = page.next_cursor
+
+    def test_pages_have_no_gaps_or_duplicates_across_ties(self):
+        for per_page in (3, 7, 10, 25, 30):
+            self.assertEqual(self.walk(per_page), self.expected)
+
+    def test_bad_cursor_restarts_at_first_page(self):
+        first_page = [project.id for project in paginate_chronological(Project.objects.all(), None, 7)]
+        cursor = paginate_chronological(Project.objects.all(), None, 7).next_cursor
+        # Inside the signed payload (the signature's last character has unused bits)
+        tampered = cursor[:5] + ('x' if cursor[5] != 'x' else 'y') + cursor[6:]
+        wrong_kind = encode_cursor({'k': 'rank', 's': 'snapshot', 'p': 7})
+        for bad in (tampered, wrong_kind, 'garbage'):
+            page = paginate_chronological(Project.objects.all(), bad, 7)
+            self.assertEqual([project.id for project in page], first_page)
+
+    def test_ranked_pages(self):
+        entries = list(range(45))
+        page, cursor = paginate_ranked(entries, 'snap', 0, 20)
+        self.assertEqual(page, entries[:20])
+        self.assertEqual(decode_ranked_cursor(cursor), ('snap', 20))
+        page, cursor = paginate_ranked(entries, 'snap', 40, 20)
+        self.assertEqual((page, cursor), (entries[40:], None))
+        time_cursor = paginate_chronological(Project.objects.all(), None, 7).next_cursor
+        self.assertEqual(decode_ranked_cursor(time_cursor), (None, 0))
+        self.assertEqual(decode_ranked_cursor(cursor), (None, 0))
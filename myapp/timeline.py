@@ -0,0 +1,98 @@
+# myapp/timeline.py
+
+"""
+Home timeline for followed creators (hybrid fan-out)
+- Fan-out-on-write: a new public project is pushed into every follower's
+  TimelineEntry rows
+- Creators with at least CELEBRITY_FOLLOWER_THRESHOLD followers are marked
+  CelebrityCreator and skipped on write; followers read their projects at
+  request time instead (fan-out-on-read)
+- Follow backfills the creator's recent projects, unfollow trims them
+"""
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import CelebrityCreator, Follow, Project, TimelineEntry
+
+
+CELEBRITY_FOLLOWER_THRESHOLD = getattr(settings, 'TIMELINE_CELEBRITY_THRESHOLD', 10000)
+# Recent projects copied into a timeline when following a creator
+TIMELINE_BACKFILL = getattr(settings, 'TIMELINE_BACKFILL', 50)
+FANOUT_BATCH_SIZE = 1000
+
+
+def is_celebrity(user_id):
+    return CelebrityCreator.objects.filter(user_id=user_id).exists()
+
+
+def _push(project, follower_ids):
+    rows = [
+        TimelineEntry(user_id=follower_id, project_id=project.id, author_id=project.user_id, created_at=project.created_at)
+        for follower_id in follower_ids
+    ]
+    TimelineEntry.objects.bulk_create(rows, batch_size=FANOUT_BATCH_SIZE, ignore_conflicts=True)
+
+
+def fan_out_project(project):
+    """Push a public project to its author's followers (no-op for celebrities)."""
+    if project.visibility != 'public' or is_celebrity(project.user_id):
+        return 0
+    follower_ids = list(Follow.objects.filter(following_id=project.user_id).values_list('follower_id', flat=True))
+    _push(project, follower_ids)
+    return len(follower_ids)
+
+
+def backfill_timeline(follower_id, creator_id, limit=TIMELINE_BACKFILL):
+    """Copy a creator's most recent public projects into one follower's timeline."""
+    if is_celebrity(creator_id):
+        return
+    projects = (
+        Project.objects.filter(user_id=creator_id, visibility='public')
+        .order_by('-created_at')
+        .only('id', 'created_at')[:limit]
+    )
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=follower_id, project_id=p.id, author_id=creator_id, created_at=p.created_at)
+            for p in projects
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def trim_timeline(follower_id, creator_id):
+    """Remove an unfollowed creator's projects from a follower's timeline."""
+    TimelineEntry.objects.filter(user_id=follower_id, author_id=creator_id).delete()
+
+
+def update_celebrity_status(creator_id):
+    """
+    Re-check a creator against the follower threshold after a follow/unfollow.
+    Promotion stops fan-out for them; demotion backfills every follower so
+    their older projects don't vanish from timelines.
+    """
+    followers = Follow.objects.filter(following_id=creator_id).count()
+    celebrity = is_celebrity(creator_id)
+    if followers >= CELEBRITY_FOLLOWER_THRESHOLD and not celebrity:
+        CelebrityCreator.objects.get_or_create(user_id=creator_id)
+    elif followers < CELEBRITY_FOLLOWER_THRESHOLD and celebrity:
+        CelebrityCreator.objects.filter(user_id=creator_id).delete()
+        projects = list(
+            Project.objects.filter(user_id=creator_id, visibility='public')
+            .order_by('-created_at')
+            .only('id', 'user_id', 'created_at')[:TIMELINE_BACKFILL]
+        )
+        follower_ids = list(Follow.objects.filter(following_id=creator_id).values_list('follower_id', flat=True))
+        for project in projects:
+            _push(project, follower_ids)
+
+
+def followed_projects_filter(user):
+    """
+    Q selecting projects from creators the user follows: their materialized
+    timeline plus celebrity creators they follow (read at request time).
+    """
+    return Q(id__in=TimelineEntry.objects.filter(user=user).values('project_id')) | Q(
+        user_id__in=CelebrityCreator.objects.filter(user__followers__follower=user).values('user_id')
+    )
@@ -0,0 +1,159 @@
+# myapp/trending.py
+
+"""
+Time-decayed project trending
+- Engagement (views, likes, comments) is counted in hourly ProjectEngagementBucket
+  rows with F() increments, so recording an event never reads a row first
+- Scores use forward decay: every bucket adds weight * exp(lambda * (hour - epoch))
+  with a fixed epoch, so an older score stays comparable with a fresh one and
+  only projects with new engagement need recomputing
+- Scores are stored as logs (logsumexp) in ProjectTrendingScore.log_score, which
+  is indexed: the top-K is an index scan
+- refresh_changed_trending_scores() runs periodically (Celery beat), recomputes
+  projects whose buckets changed since the last run and prunes old buckets
+"""
+
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Project, ProjectEngagementBucket, ProjectTrendingScore
+
+
+TRENDING_HALF_LIFE_HOURS = getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24)
+# Buckets older than this are dropped; their decayed weight is negligible
+TRENDING_WINDOW_DAYS = getattr(settings, 'TRENDING_WINDOW_DAYS', 14)
+TRENDING_WEIGHTS = {'views': 1.0, 'likes': 3.0, 'comments': 5.0}
+TRENDING_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+DECAY_RATE = math.log(2) / (TRENDING_HALF_LIFE_HOURS * 3600)
+
+WATERMARK_KEY = 'trending:watermark'
+
+
+def hour_start(value=None):
+    value = value or timezone.now()
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def add_engagement(field, deltas):
+    """
+    Add {(project_id, hour): delta} to one counter field ('views', 'likes' or
+    'comments'). One UPDATE per distinct (hour, delta).
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    now = timezone.now()
+    # Only increments create buckets: a decrement for a pruned bucket (or a
+    # project being deleted) has nothing left to take back
+    ProjectEngagementBucket.objects.bulk_create(
+        [
+            ProjectEngagementBucket(project_id=project_id, hour=hour, updated_at=now)
+            for (project_id, hour), delta in deltas.items()
+            if delta > 0
+        ],
+        ignore_conflicts=True,
+    )
+    groups = defaultdict(list)
+    for (project_id, hour), delta in deltas.items():
+        groups[(hour, delta)].append(project_id)
+    for (hour, delta), project_ids in groups.items():
+        ProjectEngagementBucket.objects.filter(hour=hour, project_id__in=project_ids).update(
+            **{field: F(field) + delta}, updated_at=now
+        )
+
+
+def record_engagement(project_id, field, delta=1, at=None):
+    """Count one engagement event in the hour bucket it happened in."""
+    add_engagement(field, {(project_id, hour_start(at)): delta})
+
+
+def bucket_log_weight(views, likes, comments, hour):
+    """log of one bucket's forward-decayed contribution, or None if it is empty."""
+    weight = (
+        views * TRENDING_WEIGHTS['views']
+        + likes * TRENDING_WEIGHTS['likes']
+        + comments * TRENDING_WEIGHTS['comments']
+    )
+    if weight <= 0:
+        return None
+    return math.log(weight) + DECAY_RATE * (hour - TRENDING_EPOCH).total_seconds()
+
+
+def _logsumexp(values):
+    peak = max(values)
+    return peak + math.log(sum(math.exp(value - peak) for value in values))
+
+
+def refresh_trending_scores(project_ids=None):
+    """
+    Recompute scores from the retained buckets of the given projects (all
+    projects with buckets when None). Returns scores written.
+    """
+    buckets = ProjectEngagementBucket.objects.all()
+    if project_ids is not None:
+        project_ids = set(project_ids)
+        if not project_ids:
+            return 0
+        buckets = buckets.filter(project_id__in=project_ids)
+
+    terms = defaultdict(list)
+    for project_id, views, likes, comments, hour in buckets.values_list(
+        'project_id', 'views', 'likes', 'comments', 'hour'
+    ).iterator():
+        term = bucket_log_weight(views, likes, comments, hour)
+        if term is not None:
+            terms[project_id].append(term)
+
+    rows = [
+        ProjectTrendingScore(project_id=project_id, log_score=_logsumexp(values))
+        for project_id, values in terms.items()
+    ]
+    ProjectTrendingScore.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['project'],
+        update_fields=['log_score', 'updated_at'],
+    )
+    stale = ProjectTrendingScore.objects.exclude(project_id__in=list(terms))
+    if project_ids is not None:
+        stale = stale.filter(project_id__in=project_ids)
+    stale.delete()
+    return len(rows)
+
+
+def prune_engagement_buckets():
+    """Drop buckets that fell out of the retention window."""
+    cutoff = hour_start() - timedelta(days=TRENDING_WINDOW_DAYS)
+    return ProjectEngagementBucket.objects.filter(hour__lt=cutoff).delete()[0]
+
+
+def refresh_changed_trending_scores():
+    """
+    Recompute scores for projects with engagement since the previous run (all
+    of them on the first run) and prune expired buckets.
+    Returns {'projects', 'pruned'}.
+    """
+    started_at = timezone.now()
+    since = cache.get(WATERMARK_KEY)
+    if since is None:
+        written = refresh_trending_scores()
+    else:
+        changed = ProjectEngagementBucket.objects.filter(updated_at__gte=since)
+        written = refresh_trending_scores(set(changed.values_list('project_id', flat=True)))
+    cache.set(WATERMARK_KEY, started_at, None)
+    # Pruned buckets carry almost no weight, so scores are not recomputed for them
+    return {'projects': written, 'pruned': prune_engagement_buckets()}
+
+
+def top_trending_projects(limit=10, queryset=None):
+    """The highest-scoring projects of queryset (public projects by default)."""
+    if queryset is None:
+        queryset = Project.objects.filter(visibility='public')
+    return queryset.filter(trending__isnull=False).order_by('-trending__log_score')[:limit]
@@ -20,6 +20,7 @@ urlpatterns = [
     # Feed
     path('feed/', views.feed, name='feed'),
     path('feed/enhanced/', views.enhanced_feed, name='enhanced_feed'),
+    path('feed/enhanced/json/', views.enhanced_feed_json, name='enhanced_feed_json'),
     
     # Projects
     path('project/create/', views.post_project, name='post_project'),
@@ -67,4 +68,5 @@ urlpatterns = [
     
     # Trending
     path('trending/', views.trending, name='trending'),
+    path('trending/tag-history/', views.tag_history_json, name='tag_history_json'),
 ]
\ No newline at end of file
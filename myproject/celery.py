@@ -0,0 +1,13 @@
+"""
+Celery application for background jobs (batch recommendations, periodic refreshes)
+Run: celery -A myproject worker -B
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+
+app = Celery('myproject')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
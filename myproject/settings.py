@@ -15,6 +15,7 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from celery.schedules import crontab
 
 # Load environment variables from .env file
 load_dotenv()
@@ -159,3 +160,125 @@ SESSION_COOKIE_AGE = 86400  # 24 hours
 SESSION_COOKIE_SECURE = False  # Set to True in production with HTTPS
 SESSION_COOKIE_HTTPONLY = True
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
+
+# AI embeddings
+EMBEDDING_PROVIDER = os.getenv('EMBEDDING_PROVIDER', 'gemini')  # 'gemini' or 'local' (offline, deterministic)
+EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'text-embedding-004')
+EMBEDDING_DIMENSIONS = int(os.getenv('EMBEDDING_DIMENSIONS', '256'))  # local provider only
+EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', '100'))
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv('EMBEDDING_MAX_CONCURRENCY', '4'))
+EMBEDDING_CACHE_SIZE = int(os.getenv('EMBEDDING_CACHE_SIZE', '4096'))  # in-process LRU entries
+
+# Approximate nearest-neighbour indexes over embeddings (rebuilt by `manage.py rebuild_ann_index`)
+ANN_INDEX_DIR = os.getenv('ANN_INDEX_DIR', os.path.join(BASE_DIR, 'var', 'ann'))
+ANN_NPROBE = int(os.getenv('ANN_NPROBE', '8'))  # IVF lists scanned per query
+
+# Precomputed project recommendations (AIRecommendation), refreshed by `manage.py refresh_recommendations`
+AI_RECOMMENDATIONS_PER_USER = int(os.getenv('AI_RECOMMENDATIONS_PER_USER', '20'))
+AI_RECOMMENDATION_BATCH_SIZE = int(os.getenv('AI_RECOMMENDATION_BATCH_SIZE', '500'))  # users per upsert batch
+AI_RECOMMENDATION_QUEUE_BATCH = int(os.getenv('AI_RECOMMENDATION_QUEUE_BATCH', '500'))  # dirty entries per worker run
+AI_RECOMMENDATION_PROJECT_FANOUT = int(os.getenv('AI_RECOMMENDATION_PROJECT_FANOUT', '100'))  # candidate users per dirty project
+
+# Celery (background jobs)
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', CELERY_BROKER_URL)
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'refresh-ai-recommendations': {
+        'task': 'myapp.tasks.refresh_ai_recommendations',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'process-recommendation-queue': {
+        'task': 'myapp.tasks.process_recommendation_queue',
+        'schedule': 60.0,
+    },
+    'refresh-trending-scores': {
+        'task': 'myapp.tasks.refresh_trending_scores',
+        'schedule': 300.0,
+    },
+    'flush-view-counts': {
+        'task': 'myapp.tasks.flush_view_counts',
+        'schedule': 10.0,
+    },
+    'reconcile-like-counts': {
+        'task': 'myapp.tasks.reconcile_like_counts',
+        'schedule': crontab(minute=30),
+    },
+    'process-ann-index-queue': {
+        'task': 'myapp.tasks.process_ann_index_queue',
+        'schedule': 60.0,
+    },
+    'rebuild-ann-index': {
+        'task': 'myapp.tasks.rebuild_ann_index',
+        'schedule': crontab(hour=2, minute=0),
+    },
+    'refresh-tag-similarity': {
+        'task': 'myapp.tasks.refresh_tag_similarity',
+        'schedule': 60.0,
+    },
+    'prune-viewer-sketches': {
+        'task': 'myapp.tasks.prune_viewer_sketches',
+        'schedule': crontab(hour=4, minute=0),
+    },
+}
+
+# Hybrid feed: max candidates pulled from each retrieval bucket before reranking
+FEED_BUCKET_SIZES = {
+    'following': int(os.getenv('FEED_BUCKET_FOLLOWING', '120')),
+    'domain': int(os.getenv('FEED_BUCKET_DOMAIN', '120')),
+    'seeking_collaborators': int(os.getenv('FEED_BUCKET_SEEKING_COLLABORATORS', '120')),
+    'trending': int(os.getenv('FEED_BUCKET_TRENDING', '120')),
+    'recent': int(os.getenv('FEED_BUCKET_RECENT', '120')),
+}
+
+# Cache: Redis when REDIS_URL is set (shared across workers), otherwise per-process memory
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'trendmia',
+        }
+    }
+
+# Ranked feed cache (per user; invalidated on follow/like/new posts from followed creators)
+FEED_CACHE_TTL = int(os.getenv('FEED_CACHE_TTL', '300'))  # seconds
+FEED_RANK_LIMIT = int(os.getenv('FEED_RANK_LIMIT', '120'))  # projects ranked per user
+
+# Seen-project filter: generation length (a seen project resurfaces after one to two periods)
+# and the score multiplier for seen projects the ranked feed still includes
+SEEN_FILTER_PERIOD_HOURS = float(os.getenv('SEEN_FILTER_PERIOD_HOURS', '72'))
+FEED_SEEN_PENALTY = float(os.getenv('FEED_SEEN_PENALTY', '0.5'))
+
+# Feed event log (impressions/clicks/likes): buffered per process, written by a background thread
+FEED_EVENT_BATCH_SIZE = int(os.getenv('FEED_EVENT_BATCH_SIZE', '500'))
+FEED_EVENT_FLUSH_INTERVAL = float(os.getenv('FEED_EVENT_FLUSH_INTERVAL', '5'))  # seconds
+
+# Home timeline fan-out: creators with at least this many followers are read at request time instead
+TIMELINE_CELEBRITY_THRESHOLD = int(os.getenv('TIMELINE_CELEBRITY_THRESHOLD', '10000'))
+TIMELINE_BACKFILL = int(os.getenv('TIMELINE_BACKFILL', '50'))  # recent projects copied in on follow
+
+# Recent comments shown under each feed card (fetched top-N per project in one query)
+FEED_COMMENT_PREVIEWS = int(os.getenv('FEED_COMMENT_PREVIEWS', '3'))
+
+# Tag similarity: weight of the co-occurrence (Jaccard) term added to the name-match score
+TAG_COOCCURRENCE_WEIGHT = float(os.getenv('TAG_COOCCURRENCE_WEIGHT', '0.5'))
+
+# Project trending: engagement half-life and how long hourly engagement buckets are kept
+TRENDING_HALF_LIFE_HOURS = float(os.getenv('TRENDING_HALF_LIFE_HOURS', '24'))
+TRENDING_WINDOW_DAYS = int(os.getenv('TRENDING_WINDOW_DAYS', '14'))
+
+# Write-behind view counter: 'redis' (shared, flushed by Celery beat) or 'memory' (per process);
+# defaults to redis when REDIS_URL is set
+VIEW_COUNTER_BACKEND = os.getenv('VIEW_COUNTER_BACKEND', '')
+VIEW_COUNTER_FLUSH_INTERVAL = int(os.getenv('VIEW_COUNTER_FLUSH_INTERVAL', '10'))  # seconds, memory backend flush thread
+
+# Unique-viewer HyperLogLog sketches: days of daily sketches kept (all-time sketches are never pruned)
+VIEWER_SKETCH_RETENTION_DAYS = int(os.getenv('VIEWER_SKETCH_RETENTION_DAYS', '90'))